@@ -0,0 +1,107 @@
+import json
+import os
+import sys
+import threading
+
+import pygame
+
+# Startup assets. Nothing in here writes next to the game's own files: the
+# font lookup is remembered in the user's cache directory, and sounds that
+# are missing or can't be decoded simply stay silent.
+
+
+# Per-user cache directory; EMOJI_DODGE_CACHE overrides it
+def cache_dir():
+    override = os.environ.get("EMOJI_DODGE_CACHE")
+    if override:
+        return override
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "emoji-dodge")
+
+
+# Finding a system font by name means scanning every installed font, which
+# pygame.font.SysFont did on every launch. The file each name resolved to
+# (or None when it isn't installed, in which case pygame's default font is
+# used just like SysFont would) is kept in fonts.json. Paths that have since
+# disappeared are looked up again; delete the file to pick up newly
+# installed fonts.
+class FontCache:
+    def __init__(self, path=None):
+        self.path = path or os.path.join(cache_dir(), "fonts.json")
+        self._paths = None
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                self._paths = json.load(f)
+        except (OSError, ValueError):
+            self._paths = {}
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w") as f:
+                json.dump(self._paths, f)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass  # Read-only home directory: we'll just scan again next time
+
+    def resolve(self, name):
+        if self._paths is None:
+            self._load()
+        path = self._paths.get(name, "")
+        if path is None or (path and os.path.exists(path)):
+            return path
+        path = pygame.font.match_font(name)
+        self._paths[name] = path
+        self._save()
+        return path
+
+    def font(self, name, size):
+        return pygame.font.Font(self.resolve(name), size)
+
+
+class SilentSound:
+    def play(self, *args, **kwargs):
+        return None
+
+
+SILENT = SilentSound()
+
+
+# The game's sounds by name. load() starts the mixer and decodes every file;
+# run it with load_in_background() so the window doesn't wait on the audio
+# device. Until a sound is in (and forever, if there's no audio device or the
+# file is missing or empty) its entry plays nothing.
+class SoundBank:
+    def __init__(self, directory, names):
+        self.directory = directory
+        self.names = list(names)
+        self.sounds = dict.fromkeys(self.names, SILENT)
+        self.loaded = threading.Event()
+
+    def __getitem__(self, name):
+        return self.sounds[name]
+
+    def load(self):
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            for name in self.names:
+                try:
+                    self.sounds[name] = pygame.mixer.Sound(os.path.join(self.directory, f"{name}.wav"))
+                except (pygame.error, OSError):
+                    pass
+        except pygame.error:
+            pass  # No audio device
+        finally:
+            self.loaded.set()
+
+    def load_in_background(self):
+        threading.Thread(target=self.load, name="sound loader", daemon=True).start()
@@ -0,0 +1,83 @@
+import json
+import os
+
+import pygame
+
+
+# Every sprite packed into one texture, handed out as subsurfaces by name.
+# The texture is converted to the display's pixel format as soon as there is
+# a display, so blits don't convert per pixel, and it can be saved as a PNG
+# plus a JSON index of where each sprite is to skip rendering next launch.
+class SpriteAtlas:
+    def __init__(self, texture, rects):
+        if pygame.display.get_surface() is not None:
+            texture = texture.convert_alpha()
+        self.texture = texture
+        self.rects = {name: pygame.Rect(rect) for name, rect in rects.items()}
+        self.sprites = {name: texture.subsurface(rect) for name, rect in self.rects.items()}
+
+    def __getitem__(self, name):
+        return self.sprites[name]
+
+    def __contains__(self, name):
+        return name in self.sprites
+
+    def __len__(self):
+        return len(self.sprites)
+
+    # Pack {name: surface} into rows ("shelves") no wider than `max_width`,
+    # tallest first so each shelf wastes little height. Sprites are kept
+    # `padding` pixels apart.
+    @classmethod
+    def pack(cls, surfaces, max_width=512, padding=1):
+        order = sorted(surfaces, key=lambda name: surfaces[name].get_height(), reverse=True)
+        rects = {}
+        x = y = shelf_height = width = 0
+        for name in order:
+            w, h = surfaces[name].get_size()
+            if x and x + w > max_width:
+                x, y = 0, y + shelf_height + padding
+                shelf_height = 0
+            rects[name] = (x, y, w, h)
+            x += w + padding
+            shelf_height = max(shelf_height, h)
+            width = max(width, x)
+
+        texture = pygame.Surface((max(width, 1), max(y + shelf_height, 1)), pygame.SRCALPHA)
+        texture.fill((0, 0, 0, 0))
+        texture.blits([(surfaces[name], rects[name][:2]) for name in order], doreturn=False)
+        return cls(texture, rects)
+
+    # Write `path`.png and `path`.json
+    def save(self, path):
+        pygame.image.save(self.texture, path + ".png")
+        with open(path + ".json", "w") as f:
+            json.dump({name: list(rect) for name, rect in self.rects.items()}, f)
+
+    # The atlas saved at `path`, or None if it isn't there or can't be read
+    @classmethod
+    def load(cls, path):
+        try:
+            with open(path + ".json") as f:
+                rects = json.load(f)
+            texture = pygame.image.load(path + ".png")
+        except (OSError, ValueError, pygame.error):
+            return None
+        return cls(texture, rects)
+
+
+# The atlas cached at `path`, or a fresh one from build() (a function
+# returning {name: surface}) that gets saved there for next time. The caller
+# puts everything the sprites depend on in the path, so a stale atlas is
+# never picked up.
+def load_or_build(path, build):
+    atlas = SpriteAtlas.load(path)
+    if atlas is not None:
+        return atlas
+    atlas = SpriteAtlas.pack(build())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        atlas.save(path)
+    except (OSError, pygame.error):
+        pass  # Nowhere to cache it; build again next launch
+    return atlas
@@ -0,0 +1,107 @@
+import time
+
+import pygame
+
+from assets import SILENT, SoundBank
+
+# 44.1kHz 16-bit stereo with a 256-sample buffer, about 6ms, so a hit is
+# heard on the frame it happens rather than a buffer or two later
+FREQUENCY = 44100
+BUFFER_SAMPLES = 256
+NUM_CHANNELS = 8
+
+# Per sound: (priority, minimum seconds between two plays). When every
+# channel is busy a sound takes over the channel of the lowest priority
+# sound playing, if that's no higher than its own, and is dropped otherwise.
+SOUND_RULES = {
+    "game_over": (5, 0.0),
+    "life_up": (4, 0.1),
+    "spin": (4, 0.1),
+    "hit": (3, 0.1),
+    "fake": (3, 0.1),
+    "powerup": (3, 0.1),
+    "storm": (2, 0.5),
+    "wind": (2, 0.5),
+    "combo": (1, 0.15),
+    "laser": (1, 0.1),
+}
+
+
+# Plays the engine's sounds on a fixed pool of reserved mixer channels.
+# Gameplay only ever calls play(), which queues the name; update() runs once
+# a frame and is the only thing that talks to the mixer. The same sound
+# queued several times in a frame (say five dodges completing a combo in one
+# tick) plays once, and a sound is skipped if it last played less than its
+# minimum interval ago.
+class AudioManager:
+    def __init__(self, directory, rules=SOUND_RULES, num_channels=NUM_CHANNELS):
+        self.rules = rules
+        self.num_channels = num_channels
+        self.bank = SoundBank(directory, rules)
+        self.channels = []
+        self.playing = []
+        self.started_at = []
+        self.last_played = {}
+        self.queue = []
+        self.played = 0
+        self.dropped = 0
+
+    # Set up a low-latency mixer and load the sounds in the background
+    def start(self):
+        pygame.mixer.pre_init(FREQUENCY, -16, 2, BUFFER_SAMPLES)
+        self.bank.load_in_background()
+
+    def play(self, name):
+        self.queue.append(name)
+
+    def _open_channels(self):
+        if pygame.mixer.get_num_channels() < self.num_channels:
+            pygame.mixer.set_num_channels(self.num_channels)
+        pygame.mixer.set_reserved(self.num_channels)
+        self.channels = [pygame.mixer.Channel(i) for i in range(self.num_channels)]
+        self.playing = [None] * self.num_channels
+        self.started_at = [0.0] * self.num_channels
+
+    # A free channel, else the one playing the lowest priority sound (the
+    # oldest of those) if it's no more important than `priority`, else None
+    def _channel_for(self, priority):
+        best = None
+        for i, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return i
+            key = (self.rules[self.playing[i]][0], self.started_at[i])
+            if best is None or key < best[0]:
+                best = (key, i)
+        if best[0][0] <= priority:
+            return best[1]
+        return None
+
+    def update(self, now=None):
+        if not self.queue:
+            return
+        queue = list(dict.fromkeys(self.queue))
+        self.queue.clear()
+        # Nothing can play until the loader is done, and then only if it got
+        # the mixer going
+        if not self.bank.loaded.is_set() or not pygame.mixer.get_init():
+            return
+        if not self.channels:
+            self._open_channels()
+
+        now = time.perf_counter() if now is None else now
+        queue.sort(key=lambda name: self.rules[name][0], reverse=True)
+        for name in queue:
+            sound = self.bank[name]
+            priority, interval = self.rules[name]
+            last = self.last_played.get(name)
+            if sound is SILENT or (last is not None and now - last < interval):
+                continue
+            i = self._channel_for(priority)
+            if i is None:
+                self.dropped += 1
+                continue
+            self.channels[i].play(sound)
+            self.playing[i] = name
+            self.started_at[i] = now
+            self.last_played[name] = now
+            self.played += 1
@@ -0,0 +1,424 @@
+import argparse
+import time
+
+import numpy as np
+
+from engine import (GameSettings, SCREEN_WIDTH, SCREEN_HEIGHT, TICK_RATE,
+                    INPUT_LEFT, INPUT_RIGHT)
+from entities import NUM_OBSTACLE_KINDS, NUM_KINDS, SAVIOR, FAKE_SAVIOR, SLOW_TIME, swept_overlap
+
+# Per-game state, one entry per game in the batch. Kept as a list so
+# compaction can drop finished games from all of them at once.
+GAME_ARRAYS = ("ids", "game_tick", "now", "player_x", "lives", "score", "survival_score", "combo_count",
+               "obstacle_speed", "next_difficulty", "next_savior", "next_slow_time",
+               "storm_active", "next_storm", "invincible_until", "slow_time_until",
+               "wind_phase", "wind_until", "wind_direction", "next_shot")
+ENTITY_ARRAYS = ("x", "y", "kind", "active")
+
+# Wind phases
+WIND_IDLE, WIND_WARNING, WIND_BLOWING = 0, 1, 2
+
+
+# Runs N independent games of the same rules as GameEngine in lockstep, one
+# NumPy array per piece of state with the game as the first axis. Falling
+# entities live in (games, slots) arrays with an `active` mask; a game that
+# needs more slots than there are grows every game's arrays.
+#
+# Each game keeps its own clock and every timer is a per-game deadline in
+# seconds of that game, so single games can be restarted with reset_games()
+# while the rest carry on. run() instead writes finished games to the
+# results and drops them from the batch, so the cost of a tick follows the
+# number of games still running. Bot inputs use the same INPUT_* bitmask as
+# GameEngine.step; cosmetic state (day/night, the combo banner, chat
+# bubbles) isn't simulated.
+class BatchSimulator:
+    def __init__(self, games, settings=None, seed=None, slots=16):
+        self.settings = settings or GameSettings()
+        settings = self.settings
+        self.games = games
+        self.rng = np.random.default_rng(seed)
+        self.tick = 0
+
+        self.player_y = SCREEN_HEIGHT - settings.player_size - 10
+        self.kind_size = np.where(np.arange(NUM_KINDS) < NUM_OBSTACLE_KINDS,
+                                  settings.obstacle_size, settings.powerup_size).astype(np.float64)
+
+        # Per-game state, filled in by reset_games()
+        self.ids = np.arange(games)
+        self.game_tick = np.zeros(games, dtype=np.int64)
+        self.now = np.zeros(games)
+        self.player_x = np.zeros(games)
+        self.lives = np.zeros(games, dtype=np.int64)
+        self.score = np.zeros(games, dtype=np.int64)
+        self.survival_score = np.zeros(games, dtype=np.int64)
+        self.combo_count = np.zeros(games, dtype=np.int64)
+        self.obstacle_speed = np.zeros(games)
+        self.next_difficulty = np.zeros(games)
+        self.next_savior = np.zeros(games)
+        self.next_slow_time = np.zeros(games)
+        self.storm_active = np.zeros(games, dtype=bool)
+        self.next_storm = np.zeros(games)
+        self.invincible_until = np.zeros(games)
+        self.slow_time_until = np.zeros(games)
+        self.wind_phase = np.zeros(games, dtype=np.int8)
+        self.wind_until = np.zeros(games)
+        self.wind_direction = np.zeros(games)
+        self.next_shot = np.zeros(games)
+
+        # Falling entities
+        self.x = np.zeros((games, slots))
+        self.y = np.zeros((games, slots))
+        self.kind = np.zeros((games, slots), dtype=np.int8)
+        self.active = np.zeros((games, slots), dtype=bool)
+
+        # Results, by game id
+        self.final_score = np.zeros(games, dtype=np.int64)
+        self.final_survival_score = np.zeros(games, dtype=np.int64)
+        self.finished = np.zeros(games, dtype=bool)
+
+        self.reset_games(np.arange(games))
+
+    def __len__(self):
+        return len(self.ids)
+
+    # Start the games in the given rows over, like GameEngine.reset
+    def reset_games(self, rows):
+        settings = self.settings
+        count = len(rows)
+        self.game_tick[rows] = 0
+        self.now[rows] = 0.0
+        self.player_x[rows] = SCREEN_WIDTH // 2 - settings.player_size // 2
+        self.lives[rows] = settings.max_lives
+        self.score[rows] = 0
+        self.survival_score[rows] = 0
+        self.combo_count[rows] = 0
+        self.obstacle_speed[rows] = settings.base_obstacle_speed
+        self.next_difficulty[rows] = settings.difficulty_increase_interval
+        self.next_savior[rows] = settings.savior_spawn_interval
+        self.next_slow_time[rows] = settings.slow_time_interval
+        self.storm_active[rows] = False
+        self.next_storm[rows] = settings.emoji_storm_trigger_time
+        self.invincible_until[rows] = 0.0
+        self.slow_time_until[rows] = 0.0
+        self.wind_phase[rows] = WIND_IDLE
+        self.wind_until[rows] = self.rng.uniform(25, 40, count)
+        self.wind_direction[rows] = 0.0
+        self.next_shot[rows] = settings.companion_shoot_interval
+        self.active[rows] = False
+
+    # Effective per-game speeds this tick
+    def speeds(self):
+        settings = self.settings
+        slow = np.where(self.slow_time_until > self.now, 0.5, 1.0)
+        obstacle_speed = self.obstacle_speed * slow * np.where(self.storm_active, 1.5, 1.0)
+        powerup_speed = settings.powerup_speed * slow
+        wind_dx = np.where(self.wind_phase == WIND_BLOWING,
+                           settings.wind_strength * self.wind_direction, 0.0)
+        return obstacle_speed, powerup_speed, wind_dx
+
+    def spawn(self, games, kinds, size):
+        if not len(games):
+            return
+        free = ~self.active[games]
+        if not free.any(axis=1).all():
+            self._grow(self.active.shape[1] * 2)
+            free = ~self.active[games]
+        slots = np.argmax(free, axis=1)
+        self.x[games, slots] = self.rng.integers(0, SCREEN_WIDTH - size, len(games), endpoint=True)
+        self.y[games, slots] = -size
+        self.kind[games, slots] = kinds
+        self.active[games, slots] = True
+
+    def _grow(self, slots):
+        for name in ENTITY_ARRAYS:
+            old = getattr(self, name)
+            new = np.zeros((old.shape[0], slots), dtype=old.dtype)
+            new[:, :old.shape[1]] = old
+            setattr(self, name, new)
+
+    # Advance every game in the batch by one tick. `inputs` is one INPUT_*
+    # bitmask per game, in the order of self.ids. Games that are over keep
+    # stepping until they're reset or dropped.
+    def step(self, inputs):
+        settings = self.settings
+        self.tick += 1
+        self.game_tick += 1
+        self.now = now = self.game_tick / TICK_RATE
+
+        # Difficulty and the power-up drops
+        due = now >= self.next_difficulty
+        self.obstacle_speed[due] += 0.5
+        self.next_difficulty[due] += settings.difficulty_increase_interval
+
+        due = np.flatnonzero(now >= self.next_savior)
+        if len(due):
+            kinds = np.where(self.rng.integers(1, 4, len(due), endpoint=True) == 1, FAKE_SAVIOR, SAVIOR)
+            self.spawn(due, kinds, settings.powerup_size)
+            self.next_savior[due] += settings.savior_spawn_interval
+
+        due = np.flatnonzero(now >= self.next_slow_time)
+        if len(due):
+            self.spawn(due, SLOW_TIME, settings.powerup_size)
+            self.next_slow_time[due] += settings.slow_time_interval
+
+        # Storm: on for its duration, then off until the next trigger
+        due = now >= self.next_storm
+        if due.any():
+            self.storm_active[due] = ~self.storm_active[due]
+            self.next_storm[due] += np.where(self.storm_active[due], settings.emoji_storm_duration,
+                                             settings.emoji_storm_trigger_time)
+
+        # Wind: warning, gust, then wait for the next one
+        changing = now >= self.wind_until
+        if changing.any():
+            phase = self.wind_phase
+            warn = changing & (phase == WIND_IDLE)
+            blow = changing & (phase == WIND_WARNING)
+            calm = changing & (phase == WIND_BLOWING)
+            self.wind_direction[warn] = self.rng.choice([-1.0, 1.0], np.count_nonzero(warn))
+            self.wind_until[warn] += settings.wind_warning_duration
+            self.wind_until[blow] += settings.wind_duration
+            self.wind_until[calm] += self.rng.uniform(25, 40, np.count_nonzero(calm))
+            phase[changing] = (phase[changing] + 1) % 3
+
+        self.fire_companions(now)
+        self.survival_score += 1
+
+        # Player movement
+        prev_player_x = self.player_x.copy()
+        left = (inputs & INPUT_LEFT).astype(bool) & (self.player_x > 0)
+        self.player_x[left] -= settings.player_speed
+        right = (inputs & INPUT_RIGHT).astype(bool) & (self.player_x < SCREEN_WIDTH - settings.player_size)
+        self.player_x[right] += settings.player_speed
+
+        # Randomly spawn obstacles
+        spawning = np.flatnonzero(self.rng.random(len(self.ids)) * settings.obstacle_spawn_rate < 1)
+        self.spawn(spawning, self.rng.integers(0, NUM_OBSTACLE_KINDS, len(spawning)), settings.obstacle_size)
+
+        self.update_entities(prev_player_x)
+
+    def fire_companions(self, now):
+        settings = self.settings
+        due = np.flatnonzero(now >= self.next_shot)
+        if not settings.companion_active or not len(due):
+            return
+        target = self.active[due] & (self.kind[due] < NUM_OBSTACLE_KINDS)
+        dist = np.where(target, (self.x[due] - self.player_x[due, None]) ** 2 +
+                        (self.y[due] - self.player_y) ** 2, np.inf)
+        closest = np.argmin(dist, axis=1)
+        # Games with nothing to shoot at try again next tick
+        shooting = target.any(axis=1)
+        games, closest = due[shooting], closest[shooting]
+        self.active[games, closest] = False
+        self.score[games] += 1
+        self.next_shot[games] = now[games] + settings.companion_shoot_interval
+
+    def update_entities(self, prev_player_x):
+        settings = self.settings
+        obstacle_speed, powerup_speed, wind_dx = self.speeds()
+        games = len(self.ids)
+        active, kind = self.active, self.kind
+        is_obstacle = kind < NUM_OBSTACLE_KINDS
+        dy = powerup_speed[:, None] + is_obstacle * (obstacle_speed - powerup_speed)[:, None]
+        self.y += dy
+        dx = is_obstacle * wind_dx[:, None] if wind_dx.any() else np.zeros_like(dy)
+        self.x += dx
+
+        # Only entities whose fall this tick crossed the player's rows can
+        # have touched the player, and there are only ever a few of them, so
+        # from here on the work is on flat lists of (game, slot) pairs
+        max_size = self.kind_size.max()
+        near = active & (self.y + max_size > self.player_y) & (self.y - dy < self.player_y + settings.player_size)
+        near_games, near_slots = np.nonzero(near)
+        touching = swept_overlap(
+            self.x[near_games, near_slots], self.y[near_games, near_slots],
+            self.kind_size[kind[near_games, near_slots]],
+            dx[near_games, near_slots], dy[near_games, near_slots],
+            self.player_x[near_games], self.player_y, settings.player_size, settings.player_size,
+            self.player_x[near_games] - prev_player_x[near_games])
+        touch_games, touch_slots = near_games[touching], near_slots[touching]
+        touch_kind = kind[touch_games, touch_slots]
+
+        # At most one obstacle lands per tick, and none while invincible.
+        # np.nonzero runs in row order, so the first pair per game is its
+        # lowest slot, as in GameEngine.
+        landing = touch_kind < NUM_OBSTACLE_KINDS
+        hit_games, first = np.unique(touch_games[landing], return_index=True)
+        hit_slots = touch_slots[landing][first]
+        vulnerable = self.invincible_until[hit_games] <= self.now[hit_games]
+        hit_games, hit_slots = hit_games[vulnerable], hit_slots[vulnerable]
+        active[hit_games, hit_slots] = False
+        hit = np.zeros(games, dtype=bool)
+        hit[hit_games] = True
+
+        # Obstacles that left the screen without hitting the player were dodged
+        off_games, off_slots = np.nonzero(active & (self.y > SCREEN_HEIGHT))
+        dodged = np.bincount(off_games[kind[off_games, off_slots] < NUM_OBSTACLE_KINDS], minlength=games)
+        active[off_games, off_slots] = False
+        self.score += dodged * np.where(self.storm_active, 2, 1)  # Double points during emoji storm
+        self.combo_count += dodged
+        combos, self.combo_count = np.divmod(self.combo_count, settings.combo_threshold)
+        self.score += combos * settings.combo_bonus
+        self.combo_count[hit] = 0
+
+        # Powerups are picked up on touch, invincible or not
+        picked = ~landing
+        active[touch_games[picked], touch_slots[picked]] = False
+        # Then the hit comes off and the pickups apply one at a time in slot
+        # order, as in GameEngine: each savior adds a life up to max_lives
+        # and each fake takes one. A game that reaches zero lives on the way
+        # stays over, whatever a later savior brings back. np.nonzero ran in
+        # row order, so a pickup's rank among its game's ones is its turn.
+        pick_games, pick_kind = touch_games[picked], touch_kind[picked]
+        lives = self.lives - hit
+        over = lives <= 0
+        turn = np.arange(len(pick_games)) - np.searchsorted(pick_games, pick_games)
+        for t in range(turn.max() + 1 if len(turn) else 0):
+            taking = turn == t
+            saviors = pick_games[taking & (pick_kind == SAVIOR)]
+            lives[saviors] += lives[saviors] < settings.max_lives
+            fakes = pick_games[taking & (pick_kind == FAKE_SAVIOR)]
+            lives[fakes] -= 1
+            over[fakes] |= lives[fakes] <= 0
+        self.lives = np.where(over, np.minimum(lives, 0), lives)
+        faked = np.bincount(pick_games[pick_kind == FAKE_SAVIOR], minlength=games)
+        hurt = hit | (faked > 0)
+        self.invincible_until[hurt] = self.now[hurt] + settings.invincibility_time
+        slowed = touch_games[touch_kind == SLOW_TIME]
+        self.slow_time_until[slowed] = self.now[slowed] + settings.slow_time_duration
+
+    # Record the games that are over and drop them from the batch
+    def drop_finished(self):
+        over = self.lives <= 0
+        if not over.any():
+            return
+        ids = self.ids[over]
+        self.final_score[ids] = self.score[over]
+        self.final_survival_score[ids] = self.survival_score[over]
+        self.finished[ids] = True
+
+        keep = ~over
+        for name in GAME_ARRAYS + ENTITY_ARRAYS:
+            setattr(self, name, getattr(self, name)[keep])
+
+    # Play every game to the end, or until `max_seconds` of game time, with
+    # `bot(sim)` choosing the inputs. Games still running at the cut-off are
+    # recorded as they stand.
+    def run(self, bot, max_seconds=600):
+        max_ticks = int(max_seconds * TICK_RATE)
+        while len(self.ids) and self.tick < max_ticks:
+            self.step(bot(self))
+            self.drop_finished()
+        self.final_score[self.ids] = self.score
+        self.final_survival_score[self.ids] = self.survival_score
+        return self
+
+    # Score and survival distributions over all games
+    def summary(self):
+        return {"games": self.games,
+                "finished": int(np.count_nonzero(self.finished)),
+                "score": distribution(self.final_score),
+                "survival_seconds": distribution(self.final_survival_score / TICK_RATE)}
+
+
+def distribution(values):
+    p10, p50, p90 = np.percentile(values, [10, 50, 90])
+    return {"mean": float(np.mean(values)), "std": float(np.std(values)),
+            "p10": float(p10), "p50": float(p50), "p90": float(p90),
+            "max": float(np.max(values))}
+
+
+# Bots: take the simulator and return one input bitmask per running game
+
+def idle_bot(sim):
+    return np.zeros(len(sim), dtype=np.uint8)
+
+
+def random_bot(sim):
+    return sim.rng.choice(np.array([0, INPUT_LEFT, INPUT_RIGHT], dtype=np.uint8), len(sim))
+
+
+# Steps away from the lowest obstacle about to land on the player, and
+# drifts towards the nearest real power-up when nothing is coming
+def dodge_bot(sim, margin=10, lookahead_ticks=15):
+    settings = sim.settings
+    size, player_size = settings.obstacle_size, settings.player_size
+    obstacle_speed, _, _ = sim.speeds()
+    player_x = sim.player_x[:, None]
+    player_center = sim.player_x + player_size / 2
+    is_obstacle = sim.active & (sim.kind < NUM_OBSTACLE_KINDS)
+
+    reach = (obstacle_speed * lookahead_ticks)[:, None]
+    threat = (is_obstacle & (sim.y + size > sim.player_y - reach) & (sim.y < sim.player_y + player_size) &
+              (sim.x + size > player_x - margin) & (sim.x < player_x + player_size + margin))
+    rows = np.arange(len(sim))
+    lowest = np.argmax(np.where(threat, sim.y, -np.inf), axis=1)
+    threat_center = sim.x[rows, lowest] + size / 2
+    go_right = threat_center < player_center
+
+    # Hemmed in against a wall: squeeze past the other way
+    go_right |= sim.player_x < settings.player_speed
+    go_right &= sim.player_x <= SCREEN_WIDTH - player_size - settings.player_speed
+
+    wanted = sim.active & ((sim.kind == SAVIOR) | (sim.kind == SLOW_TIME))
+    target = np.argmin(np.where(wanted, np.abs(sim.x - player_x), np.inf), axis=1)
+    offset = sim.x[rows, target] + settings.powerup_size / 2 - player_center
+    seek = wanted.any(axis=1) & (np.abs(offset) > settings.player_speed)
+
+    inputs = np.zeros(len(sim), dtype=np.uint8)
+    inputs[seek] = np.where(offset[seek] > 0, INPUT_RIGHT, INPUT_LEFT)
+    dodging = threat.any(axis=1)
+    inputs[dodging] = np.where(go_right[dodging], INPUT_RIGHT, INPUT_LEFT)
+    return inputs
+
+
+BOTS = {"idle": idle_bot, "random": random_bot, "dodge": dodge_bot}
+
+
+# Turn "name=value" into a GameSettings override, typed like the default.
+# Whole-number fields still take fractions, e.g. base_obstacle_speed=5.5.
+def parse_override(settings, text):
+    name, _, value = text.partition("=")
+    if not hasattr(settings, name):
+        raise argparse.ArgumentTypeError(f"unknown setting {name!r}")
+    default = getattr(settings, name)
+    if isinstance(default, bool):
+        return name, value.lower() in ("1", "true", "yes")
+    if isinstance(default, (int, float)):
+        number = float(value)
+        return name, int(number) if isinstance(default, int) and number.is_integer() else number
+    return name, value
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play many Emoji Dodge games at once with a bot")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--bot", choices=sorted(BOTS), default="dodge")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--max-seconds", type=float, default=600, help="game time to stop at")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="override a GameSettings field, e.g. --set obstacle_spawn_rate=20")
+    args = parser.parse_args()
+
+    settings = GameSettings()
+    for text in args.set:
+        name, value = parse_override(settings, text)
+        setattr(settings, name, value)
+        if name == "max_lives":
+            settings.lives = value
+
+    start = time.perf_counter()
+    sim = BatchSimulator(args.games, settings, args.seed).run(BOTS[args.bot], args.max_seconds)
+    elapsed = time.perf_counter() - start
+
+    summary = sim.summary()
+    print(f"{args.games} games with the {args.bot} bot in {elapsed:.1f}s "
+          f"({summary['finished']} ended before {args.max_seconds:g}s)")
+    for name in ("score", "survival_seconds"):
+        stats = summary[name]
+        print(f"{name:>17}: mean {stats['mean']:8.1f}  std {stats['std']:8.1f}  p10 {stats['p10']:8.1f}  "
+              f"p50 {stats['p50']:8.1f}  p90 {stats['p90']:8.1f}  max {stats['max']:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
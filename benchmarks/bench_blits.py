@@ -0,0 +1,88 @@
+# Falling entity draw cost: one screen.blit per entity (the old draw_objects
+# loop) vs. main.py's render list submitted with a single Surface.blits call,
+# at and beyond Emoji Storm densities.
+#
+#   python benchmarks/bench_blits.py [--counts 50 200 1000 5000] [--dirty-rects]
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main  # noqa: E402  (sets up the window and sprites)
+from engine import SCREEN_WIDTH, SCREEN_HEIGHT  # noqa: E402
+from entities import NUM_KINDS  # noqa: E402
+
+
+def fill(engine, count, rng):
+    size = engine.settings.obstacle_size
+    engine.entities.clear()
+    for _ in range(count):
+        engine.entities.spawn(rng.randint(0, SCREEN_WIDTH - size),
+                               rng.uniform(-size, SCREEN_HEIGHT),
+                               rng.randrange(NUM_KINDS))
+
+
+# The per-entity loop draw_objects used before the render list
+def legacy_draw(engine, alpha):
+    back = 1 - alpha
+    obstacle_dx, obstacle_dy = engine.obstacle_step
+    obstacle_dx *= back
+    obstacle_dy *= back
+    powerup_dy = engine.powerup_step * back
+
+    add = main.renderer.add
+    blit = main.screen.blit
+    sprites = main.entity_sprites
+    xs, ys, kinds = engine.entities.live()
+    for x, y, kind in zip(xs.tolist(), ys.tolist(), kinds.tolist()):
+        if kind < main.NUM_OBSTACLE_KINDS:
+            add(blit(sprites[kind], (x - obstacle_dx, y - obstacle_dy)))
+        else:
+            add(blit(sprites[kind], (x - 5, y - powerup_dy - 5)))
+
+
+def batched_draw(engine, alpha):
+    main.draw_objects(alpha)
+    main.draw_sprites()
+
+
+def bench(count, repeats):
+    engine = main.engine
+    fill(engine, count, random.Random(count))
+    renderer = main.renderer
+    timings = []
+    for draw in (legacy_draw, batched_draw):
+        total = 0.0
+        for _ in range(repeats):
+            renderer.begin_frame(main.BLUE)
+            start = time.perf_counter()
+            draw(engine, 0.5)
+            total += time.perf_counter() - start
+            renderer.present()
+        timings.append(total / repeats)
+    return timings
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Per-entity blit vs. batched blits benchmark")
+    parser.add_argument("--counts", type=int, nargs="+", default=[50, 200, 1000, 5000])
+    parser.add_argument("--repeats", type=int, default=100)
+    parser.add_argument("--dirty-rects", action="store_true", help="collect rects for the dirty-rect renderer")
+    args = parser.parse_args()
+    main.renderer.enabled = args.dirty_rects
+
+    print(f"{'entities':>10} {'blit (ms)':>12} {'blits (ms)':>12} {'speedup':>8}")
+    for count in args.counts:
+        legacy_time, batched_time = bench(count, args.repeats)
+        print(f"{count:>10} {legacy_time * 1000:>12.3f} {batched_time * 1000:>12.3f} "
+              f"{legacy_time / batched_time:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main_cli()
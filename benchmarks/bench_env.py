@@ -0,0 +1,44 @@
+# Env steps per second for VecDodgeEnv with random actions, for both
+# observation types and a few batch sizes.
+#
+#   python benchmarks/bench_env.py [--envs 256 1024 4096] [--steps 300]
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from env import VecDodgeEnv  # noqa: E402
+
+
+def bench(num_envs, observation, steps):
+    env = VecDodgeEnv(num_envs, observation=observation, seed=0)
+    env.reset()
+    rng = np.random.default_rng(0)
+    actions = rng.integers(0, 3, (steps, num_envs))
+    episodes = 0
+    start = time.perf_counter()
+    for step_actions in actions:
+        _, _, dones, _ = env.step(step_actions)
+        episodes += int(np.count_nonzero(dones))
+    return num_envs * steps / (time.perf_counter() - start), episodes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="VecDodgeEnv throughput benchmark")
+    parser.add_argument("--envs", type=int, nargs="+", default=[256, 1024, 4096])
+    parser.add_argument("--steps", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{'envs':>8} {'observation':>12} {'steps/s':>12} {'episodes':>9}")
+    for num_envs in args.envs:
+        for observation in ("features", "raster"):
+            rate, episodes = bench(num_envs, observation, args.steps)
+            print(f"{num_envs:>8} {observation:>12} {rate:>12,.0f} {episodes:>9}")
+
+
+if __name__ == "__main__":
+    main()
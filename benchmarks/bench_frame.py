@@ -0,0 +1,227 @@
+# Per-frame hot path benchmark. Drives scripted scenarios through the engine
+# and main.py's draw functions on SDL's dummy video driver and reports the
+# time spent in each function, the resulting frames per second and how much
+# Python memory a frame allocates.
+#
+#   python benchmarks/bench_frame.py                    # run and compare to baselines
+#   python benchmarks/bench_frame.py --save-baseline    # record new baselines
+#   python benchmarks/bench_frame.py --scenarios storm obstacles_10k
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import main  # noqa: E402  (sets up the window, fonts and draw functions)
+from engine import GameEngine, SCREEN_WIDTH, INPUT_LEFT, INPUT_RIGHT, INPUT_SPIN  # noqa: E402
+from entities import NUM_OBSTACLE_KINDS  # noqa: E402
+from profiler import FrameProfiler  # noqa: E402
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+LONG = 10 ** 9  # duration that outlasts any benchmark
+
+
+# Scenario setup: each gets a fresh seeded engine and may return a hook that
+# runs before every frame to hold the scenario's conditions steady
+def setup_idle(engine):
+    return None
+
+
+def setup_storm(engine):
+    settings = engine.settings
+    settings.emoji_storm_duration = LONG
+    settings.obstacle_spawn_rate = 3
+    engine.start_storm()
+
+
+def setup_wind_storm(engine):
+    setup_storm(engine)
+    settings = engine.settings
+    settings.wind_direction = 1
+    settings.wind_duration = LONG
+    engine.start_wind()
+
+
+def top_up(count):
+    # Keep a constant number of obstacles on screen
+    def hook(engine):
+        size = engine.settings.obstacle_size
+        rng = engine.rng
+        for _ in range(count - engine.entities.count):
+            engine.entities.spawn(rng.randint(0, SCREEN_WIDTH - size),
+                                  rng.uniform(-600, -size),
+                                  rng.randrange(NUM_OBSTACLE_KINDS))
+    return hook
+
+
+def setup_obstacles(count):
+    def setup(engine):
+        hook = top_up(count)
+        hook(engine)
+        # Spread the first batch over the whole screen
+        _, y, _ = engine.entities.live()
+        y[:] = [engine.rng.uniform(-40, 600) for _ in range(len(y))]
+        return hook
+    return setup
+
+
+def setup_game_over(engine):
+    settings = engine.settings
+    settings.game_over = True
+    settings.spin_wheel_active = True
+    # Keep the wheel spinning for the whole run
+    settings.spin_wheel_deceleration = 0
+
+
+SCENARIOS = {
+    "idle": setup_idle,
+    "storm": setup_storm,
+    "wind_storm": setup_wind_storm,
+    "obstacles_1k": setup_obstacles(1000),
+    "obstacles_10k": setup_obstacles(10000),
+    "game_over_spin": setup_game_over,
+}
+
+
+def play_frame(engine, profiler, tick):
+    settings = engine.settings
+    if not settings.game_over:
+        # Wiggle left and right so the player actually moves
+        inputs = INPUT_LEFT if (tick // 30) % 2 else INPUT_RIGHT
+    else:
+        inputs = INPUT_SPIN
+
+    with profiler.phase("engine.step"):
+        engine.step(inputs)
+
+    if not settings.game_over:
+        # Never let the scenario end early, and keep a chat bubble up
+        settings.lives = settings.max_lives
+        if not settings.chat_bubble_active:
+            engine.show_chat_bubble("😱")
+
+        draws = [
+            ("fill", lambda: main.renderer.begin_frame(main.BLUE)),
+            ("draw_player", lambda: main.draw_player(engine.time, 0.5)),
+            ("draw_companion", lambda: main.draw_companion(0.5)),
+            ("draw_objects", lambda: main.draw_objects(0.5)),
+            ("draw_sprites", main.draw_sprites),
+            ("draw_laser", lambda: main.draw_laser(0.5)),
+            ("update_particles", lambda: main.update_particles(1 / 60)),
+            ("draw_particles", lambda: main.draw_particles(main.BLUE)),
+            ("draw_chat_bubble", lambda: main.draw_chat_bubble(0.5)),
+            ("draw_combo", main.draw_combo),
+            ("draw_ui", lambda: main.draw_ui(engine.time)),
+            ("flip", main.renderer.present),
+        ]
+    else:
+        draws = [
+            ("show_game_over", main.show_game_over),
+            ("draw_spin_wheel", main.draw_spin_wheel),
+            ("flip", main.pygame.display.flip),
+        ]
+
+    for name, draw in draws:
+        with profiler.phase(name):
+            draw()
+
+
+def run_scenario(name, frames, seed):
+    engine = GameEngine(seed=seed)
+    main.engine = engine
+    main.settings = engine.settings
+    main.particles.clear()
+    hook = SCENARIOS[name](engine)
+
+    # Phases are timed the same way as the in-game profiler, with the
+    # engine's own methods as sub-phases of its step
+    profiler = FrameProfiler(recent_frames=frames)
+    profiler.instrument(engine, {"update_entities": "update_entities", "run_timers": "run_timers"},
+                        parent="engine.step")
+
+    start = time.perf_counter()
+    for tick in range(frames):
+        profiler.begin_frame()
+        if hook:
+            hook(engine)
+        play_frame(engine, profiler, tick)
+    total = time.perf_counter() - start
+    profiler.begin_frame()
+    functions_ms = profiler.phase_averages(frames, sub_phases=True)
+
+    # Second, shorter pass under tracemalloc for the allocation figures
+    unused = FrameProfiler()
+    tracemalloc.start()
+    allocated = 0
+    sample = max(1, frames // 10)
+    for tick in range(sample):
+        if hook:
+            hook(engine)
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        play_frame(engine, unused, tick)
+        allocated += tracemalloc.get_traced_memory()[1] - before
+    tracemalloc.stop()
+
+    return {
+        "fps": frames / total,
+        "frame_ms": total / frames * 1000,
+        "alloc_kib_per_frame": allocated / sample / 1024,
+        "functions_ms": functions_ms,
+    }
+
+
+def change(new, old):
+    if not old:
+        return ""
+    return f" ({(new - old) / old * 100:+.0f}%)"
+
+
+def report(name, result, baseline):
+    base = baseline or {}
+    base_functions = base.get("functions_ms", {})
+    print(f"\n== {name}: {result['fps']:.0f} FPS{change(result['fps'], base.get('fps'))}, "
+          f"{result['frame_ms']:.3f} ms/frame, "
+          f"{result['alloc_kib_per_frame']:.1f} KiB allocated/frame"
+          f"{change(result['alloc_kib_per_frame'], base.get('alloc_kib_per_frame'))}")
+    for fn, ms in sorted(result["functions_ms"].items(), key=lambda item: -item[1]):
+        print(f"   {fn:<28} {ms:8.3f} ms{change(ms, base_functions.get(fn))}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Per-frame hot path benchmark")
+    parser.add_argument("--scenarios", nargs="+", choices=sorted(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--dirty-rects", action="store_true", help="benchmark the dirty-rect renderer")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"write the results to {os.path.relpath(BASELINE_PATH, ROOT)}")
+    args = parser.parse_args()
+    main.renderer.enabled = args.dirty_rects
+
+    baselines = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baselines = json.load(f)
+
+    results = {}
+    for name in args.scenarios:
+        results[name] = run_scenario(name, args.frames, args.seed)
+        report(name, results[name], None if args.save_baseline else baselines.get(name))
+
+    if args.save_baseline:
+        baselines.update(results)
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        print(f"\nSaved baselines to {BASELINE_PATH}")
+
+
+if __name__ == "__main__":
+    main_cli()
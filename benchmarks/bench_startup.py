@@ -0,0 +1,48 @@
+# Time from launching main.py to its first frame, on SDL's dummy drivers.
+# Each run is a fresh process started with --time-startup; the first run
+# uses an empty cache directory so it includes the system font scan.
+#
+#   python benchmarks/bench_startup.py [--runs 5]
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Time to first frame we aim to stay under with a warm cache
+TARGET_MS = 1000
+
+
+def launch(cache):
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy", EMOJI_DODGE_CACHE=cache)
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, os.path.join(ROOT, "main.py"), "--time-startup"],
+                            env=env, capture_output=True, text=True, check=True).stdout
+    wall = time.perf_counter() - start
+    return float(re.search(r"First frame after (\d+) ms", output).group(1)), wall * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="main.py time-to-first-frame benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="warm-cache launches")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache:
+        cold, cold_wall = launch(cache)
+        warm = [launch(cache) for _ in range(args.runs)]
+
+    first_frame = statistics.median(ms for ms, _ in warm)
+    wall = statistics.median(ms for _, ms in warm)
+    print(f"cold cache: first frame {cold:.0f} ms (process {cold_wall:.0f} ms)")
+    print(f"warm cache: first frame {first_frame:.0f} ms (process {wall:.0f} ms), median of {args.runs}")
+    print(f"target {TARGET_MS} ms: {'ok' if first_frame <= TARGET_MS else 'MISSED'}")
+    return 0 if first_frame <= TARGET_MS else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
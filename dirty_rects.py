@@ -0,0 +1,62 @@
+import pygame
+
+
+# Optional renderer that only repaints the parts of the screen that changed.
+# Draw code reports every rect it touches with add(); at the start of the
+# next frame those rects are painted back to the background, and only the
+# union of last frame's and this frame's rects is pushed to the display.
+# Anything that changes the whole screen (a new background colour, the storm
+# flash, too many moving objects) falls back to a full fill and flip.
+class DirtyRectRenderer:
+    def __init__(self, screen, enabled=True, max_rects=200):
+        self.screen = screen
+        self.enabled = enabled
+        self.max_rects = max_rects
+        self.rects = []
+        self._previous = []
+        self._background = None
+        self._full_redraw = True
+
+    def request_full_redraw(self):
+        self._full_redraw = True
+
+    # For frames drawn and flipped without begin_frame() and present(), like
+    # the game over screen: forget the rects they reported and start the
+    # next tracked frame from a full redraw
+    def skip_frame(self):
+        self.rects = []
+        self._full_redraw = True
+
+    def add(self, rect):
+        self.rects.append(rect)
+        return rect
+
+    # Blit a sequence of (surface, position) pairs in one call. The rects are
+    # only worth asking SDL for when they're going to be used.
+    def blits(self, sequence):
+        if self.enabled:
+            self.rects.extend(self.screen.blits(sequence))
+        else:
+            self.screen.blits(sequence, doreturn=False)
+
+    def begin_frame(self, background):
+        self.rects = []
+        if background != self._background:
+            self._background = background
+            self._full_redraw = True
+
+        if not self.enabled or self._full_redraw or len(self._previous) > self.max_rects:
+            self.screen.fill(background)
+        else:
+            # Erase last frame's objects
+            for rect in self._previous:
+                self.screen.fill(background, rect)
+
+    def present(self):
+        full = not self.enabled or self._full_redraw
+        if full or len(self._previous) + len(self.rects) > self.max_rects:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._previous + self.rects)
+        self._previous = self.rects
+        self._full_redraw = False
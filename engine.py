@@ -0,0 +1,549 @@
+import math
+import random
+
+import numpy as np
+
+from entities import (EntityPool, NUM_OBSTACLE_KINDS, NUM_KINDS,
+                      SAVIOR, FAKE_SAVIOR, SLOW_TIME)
+from spatial import SpatialGrid
+from scheduler import Scheduler
+
+# Playfield dimensions
+SCREEN_WIDTH = 800
+SCREEN_HEIGHT = 600
+
+# Input flags passed to GameEngine.step
+INPUT_LEFT = 1
+INPUT_RIGHT = 2
+INPUT_SPIN = 4
+INPUT_RESTART = 8
+
+# Fixed simulation tick. All per-step movement (pixels per step) and the
+# spawn odds are tuned for this rate, so the game plays the same no matter
+# how fast frames are drawn.
+TICK_RATE = 60
+
+
+# A spin starts at `speed` degrees per tick and slows by `deceleration` every
+# tick, turning speed - k * deceleration degrees on tick k for as long as
+# that's positive, and comes to rest on the tick after. Returns that tick and
+# the total turn, the sum of the arithmetic series.
+def spin_wheel_stop(speed, deceleration):
+    turning_ticks = max(math.ceil(speed / deceleration) - 1, 0)
+    return turning_ticks + 1, turning_ticks * speed - deceleration * turning_ticks * (turning_ticks + 1) / 2
+
+
+# The option the pointer is on at `angle`; sector i covers [i, i + 1) times
+# 360 / options degrees
+def spin_wheel_sector(angle, options):
+    return int((angle % 360) / (360 / options))
+
+
+# Game settings
+class GameSettings:
+    def __init__(self):
+        # Player settings
+        self.player_size = 50
+        self.player_speed = 8
+        self.player_emojis = ['😎', '🐱', '🦸‍♂️']
+        self.current_emoji_index = 0
+
+        # Lives system
+        self.max_lives = 3
+        self.lives = self.max_lives
+        self.invincibility_time = 1.5
+        self.is_invincible = False
+
+        # Combo system
+        self.combo_count = 0
+        self.combo_threshold = 10
+        self.combo_bonus = 50
+        self.show_combo = False
+        self.combo_duration = 3
+
+        # Day/Night cycle
+        self.is_night_mode = False
+        self.day_night_interval = 30
+
+        # Obstacle settings
+        self.obstacle_size = 40
+        self.base_obstacle_speed = 5
+        self.obstacle_speed = self.base_obstacle_speed
+        self.obstacle_spawn_rate = 30
+
+        # Powerup settings
+        self.powerup_size = 40
+        self.powerup_speed = 3
+        self.savior_spawn_interval = 15
+
+        # Slow time powerup
+        self.slow_time_active = False
+        self.slow_time_duration = 5
+        self.slow_time_interval = 20
+
+        # Emoji Storm mode
+        self.emoji_storm_active = False
+        self.emoji_storm_duration = 10
+        self.emoji_storm_trigger_time = 60
+        self.storm_flash_intensity = 0
+
+        # Companion robot
+        self.companion_active = True
+        self.companion_offset_x = 30
+        self.companion_offset_y = 10
+        self.companion_shoot_interval = 15
+        self.companion_shooting = False
+        self.companion_shoot_duration = 0.5
+        self.companion_target = None
+
+        # Wind effect
+        self.wind_active = False
+        self.wind_direction = 0  # -1 for left, 1 for right
+        self.wind_duration = 5
+        self.wind_strength = 2
+        self.wind_warning_shown = False
+        self.wind_warning_duration = 2
+
+        # Chat bubble
+        self.chat_bubble_active = False
+        self.chat_bubble_text = ""
+        self.chat_bubble_duration = 2
+
+        # Spin wheel
+        self.spin_wheel_active = False
+        self.spin_wheel_spinning = False
+        self.spin_wheel_result = None
+        self.spin_wheel_options = ["Retry", "Retry +1 Life", "Exit"]
+        self.spin_wheel_angle = 0
+        self.spin_wheel_speed = 0
+        self.spin_wheel_deceleration = 0.2
+        self.spin_start_time = 0
+        # Where a spin stops is worked out when it starts; with the animation
+        # off (headless runs) the result applies right away
+        self.spin_wheel_animated = True
+        self.spin_wheel_start_angle = 0
+        self.spin_wheel_start_speed = 0
+        self.spin_wheel_ticks = 0
+        self.spin_wheel_stop_ticks = None
+        self.spin_wheel_outcome = None
+
+        # Game state
+        self.score = 0
+        self.survival_score = 0
+        self.game_over = False
+        self.game_over_overlay_alpha = 0
+
+        # Timer for increasing difficulty
+        self.start_time = 0
+        self.difficulty_increase_interval = 10
+
+
+# Headless simulation of one game. Owns the world state and has no display,
+# font or mixer dependency; the front-end feeds it inputs and reads back the
+# state to draw and the events (sound names) to play.
+#
+# All randomness comes from the engine's own generator, so a run is fully
+# determined by its seed and the inputs given to each step.
+class GameEngine:
+    def __init__(self, settings=None, seed=None):
+        self.settings = settings if settings is not None else GameSettings()
+        if seed is None:
+            seed = random.randrange(2 ** 63)
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.time = 0.0
+        self.tick = 0
+        self.events = []
+
+        # Player position
+        self.player_x = SCREEN_WIDTH // 2 - self.settings.player_size // 2
+        self.prev_player_x = self.player_x
+        self.player_y = SCREEN_HEIGHT - self.settings.player_size - 10
+
+        # Game objects: obstacles and powerups share one entity pool
+        self.entities = EntityPool()
+        self.kind_dx = np.zeros(NUM_KINDS)
+        self.kind_dy = np.zeros(NUM_KINDS)
+        self.kind_size = np.zeros(NUM_KINDS)
+
+        # Cell index over the pool, so collision and targeting only look at
+        # entities near the player
+        self.grid = SpatialGrid(SCREEN_WIDTH, SCREEN_HEIGHT)
+
+        # Everything that happens after a delay or on an interval
+        self.scheduler = Scheduler()
+
+        self.reset()
+
+    def reset(self, extra_life=False):
+        settings = self.settings
+
+        self.entities.clear()
+
+        self.player_x = SCREEN_WIDTH // 2 - settings.player_size // 2
+        self.prev_player_x = self.player_x
+
+        # Distance objects moved during the last step, used to interpolate
+        # positions between two steps when rendering
+        self.obstacle_step = (0, 0)
+        self.powerup_step = 0
+
+        current_time = self.time
+        settings.score = 0
+        settings.survival_score = 0
+        settings.obstacle_speed = settings.base_obstacle_speed
+        settings.start_time = current_time
+        settings.game_over_overlay_alpha = 0
+        settings.lives = settings.max_lives + (1 if extra_life else 0)
+        settings.is_invincible = False
+        settings.companion_shooting = False
+        settings.companion_target = None
+        settings.combo_count = 0
+        settings.show_combo = False
+        settings.slow_time_active = False
+        settings.emoji_storm_active = False
+        settings.wind_active = False
+        settings.wind_warning_shown = False
+        settings.chat_bubble_active = False
+        settings.is_night_mode = False
+        settings.game_over = False
+        settings.spin_wheel_active = False
+        settings.spin_wheel_spinning = False
+        settings.spin_wheel_result = None
+        settings.spin_wheel_outcome = None
+
+        # Start the game's clocks over
+        scheduler = self.scheduler
+        scheduler.clear()
+        scheduler.time = current_time
+        # Callbacks look the method up when they fire, so a wrapper installed
+        # on the instance afterwards (the profiler's, say) still sees them
+        scheduler.every(settings.difficulty_increase_interval, "difficulty", lambda: self.increase_difficulty())
+        scheduler.every(settings.savior_spawn_interval, "savior", lambda: self.spawn_savior())
+        scheduler.every(settings.slow_time_interval, "slow_time_spawn", lambda: self.spawn_slow_time())
+        scheduler.every(settings.day_night_interval, "day_night", lambda: self.toggle_day_night())
+        scheduler.after(settings.emoji_storm_trigger_time, "storm", lambda: self.start_storm())
+        scheduler.after(self.rng.uniform(25, 40), "wind", lambda: self.warn_wind())
+        scheduler.after(settings.companion_shoot_interval, "companion", lambda: self.fire_companion())
+
+    # Advance the simulation by one fixed tick. `inputs` is a bitmask of
+    # INPUT_* flags. Timers run on simulation time, never the wall clock, so
+    # headless runs can go as fast as the CPU allows.
+    def step(self, inputs):
+        settings = self.settings
+        self.events = []
+        self.tick += 1
+        self.time = self.tick / TICK_RATE
+        current_time = self.time
+        self.prev_player_x = self.player_x
+
+        if settings.game_over:
+            # Fade in the game over overlay
+            if settings.game_over_overlay_alpha < 180:
+                settings.game_over_overlay_alpha += 5
+
+            # Restart game
+            if inputs & INPUT_RESTART:
+                self.reset()
+                return
+
+            self.update_spin_wheel(inputs)
+            return
+
+        # Fire every timer that's due: spawns, difficulty, day/night, storm,
+        # wind, the companion's shots and status effects running out
+        self.run_timers(current_time)
+
+        # Increase survival score
+        settings.survival_score += 1
+
+        # Player movement
+        if inputs & INPUT_LEFT and self.player_x > 0:
+            self.player_x -= settings.player_speed
+        if inputs & INPUT_RIGHT and self.player_x < SCREEN_WIDTH - settings.player_size:
+            self.player_x += settings.player_speed
+
+        # Randomly spawn obstacles
+        if self.rng.randint(1, settings.obstacle_spawn_rate) == 1:
+            self.spawn_obstacle()
+
+        # Update game objects
+        self.update_entities()
+
+    def spawn_obstacle(self):
+        x = self.rng.randint(0, SCREEN_WIDTH - self.settings.obstacle_size)
+        y = -self.settings.obstacle_size
+        kind = self.rng.randrange(NUM_OBSTACLE_KINDS)
+        self.entities.spawn(x, y, kind)
+
+    def spawn_savior(self):
+        x = self.rng.randint(0, SCREEN_WIDTH - self.settings.powerup_size)
+        y = -self.settings.powerup_size
+
+        # 1 in 4 chance to spawn a fake savior
+        if self.rng.randint(1, 4) == 1:
+            self.entities.spawn(x, y, FAKE_SAVIOR)
+        else:
+            self.entities.spawn(x, y, SAVIOR)
+
+    def spawn_slow_time(self):
+        x = self.rng.randint(0, SCREEN_WIDTH - self.settings.powerup_size)
+        y = -self.settings.powerup_size
+        self.entities.spawn(x, y, SLOW_TIME)
+
+    def run_timers(self, current_time):
+        self.scheduler.run(current_time)
+
+    # Turn on a boolean setting and turn it off again `duration` seconds
+    # later. The timer is named after the setting, so the HUD can ask how
+    # long is left and setting it again restarts the countdown.
+    def set_flag_for(self, flag, duration):
+        setattr(self.settings, flag, True)
+        self.scheduler.after(duration, flag, lambda: self.expire_flag(flag))
+
+    def expire_flag(self, flag):
+        setattr(self.settings, flag, False)
+
+    def show_chat_bubble(self, text):
+        self.settings.chat_bubble_text = text
+        self.set_flag_for("chat_bubble_active", self.settings.chat_bubble_duration)
+
+    def increase_difficulty(self):
+        self.settings.obstacle_speed += 0.5
+
+    def toggle_day_night(self):
+        self.settings.is_night_mode = not self.settings.is_night_mode
+
+    def hit_player(self, sound):
+        settings = self.settings
+        settings.lives -= 1
+        self.events.append(sound)
+
+        # Show scared emoji
+        self.show_chat_bubble("😱")
+
+        self.set_flag_for("is_invincible", settings.invincibility_time)
+
+        if settings.lives <= 0:
+            settings.game_over = True
+            self.events.append("game_over")
+
+    def update_entities(self):
+        settings = self.settings
+        obstacle_speed = settings.obstacle_speed
+        powerup_speed = settings.powerup_speed
+
+        # Apply modifiers
+        if settings.slow_time_active:
+            obstacle_speed *= 0.5  # 50% slower when slow time is active
+            powerup_speed *= 0.5
+        if settings.emoji_storm_active:
+            obstacle_speed *= 1.5  # 50% faster during emoji storm
+
+        # Wind only pushes obstacles
+        wind_dx = settings.wind_strength * settings.wind_direction if settings.wind_active else 0
+        self.obstacle_step = (wind_dx, obstacle_speed)
+        self.powerup_step = powerup_speed
+
+        if not self.entities.count:
+            return
+
+        # Per-kind movement and size tables, looked up for every entity at once
+        self.kind_dx[:NUM_OBSTACLE_KINDS] = wind_dx
+        self.kind_dy[:NUM_OBSTACLE_KINDS] = obstacle_speed
+        self.kind_dy[NUM_OBSTACLE_KINDS:] = powerup_speed
+        self.kind_size[:NUM_OBSTACLE_KINDS] = settings.obstacle_size
+        self.kind_size[NUM_OBSTACLE_KINDS:] = settings.powerup_size
+
+        x, y, kind = self.entities.live()
+        if wind_dx:
+            x += self.kind_dx[kind]
+        y += self.kind_dy[kind]
+
+        is_obstacle = kind < NUM_OBSTACLE_KINDS
+        off_screen = y > SCREEN_HEIGHT
+
+        # Only entities that ended up within one tick's move and one entity
+        # size of the player's path can have touched it
+        self.grid.update(x, y)
+        reach_x = self.kind_size.max() + abs(wind_dx)
+        reach_y = self.kind_size.max() + self.kind_dy.max()
+        left = min(self.player_x, self.prev_player_x)
+        right = max(self.player_x, self.prev_player_x) + settings.player_size
+        nearby = self.grid.query(left - reach_x, self.player_y - reach_y,
+                                 right + reach_x, self.player_y + settings.player_size + reach_y)
+
+        # Test the whole path each of them and the player took this tick, so
+        # obstacles faster than the player is tall still can't pass through
+        touching = np.zeros(len(kind), dtype=bool)
+        if len(nearby):
+            nearby_kind = kind[nearby]
+            touching[nearby] = self.entities.swept_overlaps(
+                self.kind_size[nearby_kind], self.kind_dx[nearby_kind] if wind_dx else 0.0,
+                self.kind_dy[nearby_kind], self.player_x, self.player_y,
+                settings.player_size, settings.player_size,
+                box_dx=self.player_x - self.prev_player_x, indices=nearby)
+
+        # Check collision with player if not invincible. A hit makes the player
+        # invincible, so at most one obstacle can land per tick.
+        hit = -1
+        if not settings.is_invincible:
+            hits = np.flatnonzero(touching & is_obstacle)
+            if len(hits):
+                hit = int(hits[0])
+
+        # Obstacles that left the screen without hitting the player were dodged
+        dead = off_screen
+        passed = off_screen & is_obstacle
+        if hit >= 0:
+            passed[hit] = False
+        dodged = int(np.count_nonzero(passed))
+        if dodged:
+            # Award points
+            point_value = 1
+            if settings.emoji_storm_active:
+                point_value *= 2  # Double points during emoji storm
+
+            settings.score += point_value * dodged
+            settings.combo_count += dodged
+            self.check_combo()
+
+        if hit >= 0:
+            dead[hit] = True
+            settings.combo_count = 0
+            self.hit_player("hit")
+
+        # Powerups are picked up on touch, invincible or not
+        for i in np.flatnonzero(touching & ~is_obstacle).tolist():
+            dead[i] = True
+            if kind[i] == SAVIOR:
+                if settings.lives < settings.max_lives:
+                    settings.lives += 1
+                    self.events.append("life_up")
+                    self.show_chat_bubble("💪")
+            elif kind[i] == FAKE_SAVIOR:
+                self.hit_player("fake")
+            else:
+                self.set_flag_for("slow_time_active", settings.slow_time_duration)
+                self.events.append("powerup")
+                self.show_chat_bubble("⏳")
+
+        self.entities.remove_mask(dead)
+
+    def fire_companion(self):
+        settings = self.settings
+        x, y, kind = self.entities.live()
+        closest = -1
+        if settings.companion_active:
+            self.grid.update(x, y)
+            # Find the closest obstacle
+            closest = self.grid.nearest(self.player_x, self.player_y, x, y, kind < NUM_OBSTACLE_KINDS)
+
+        if closest < 0:
+            # Nothing to shoot at; try again next tick
+            self.scheduler.at((self.tick + 1) / TICK_RATE, "companion", self.fire_companion)
+            return
+
+        settings.companion_target = (float(x[closest]), float(y[closest]))
+        self.set_flag_for("companion_shooting", settings.companion_shoot_duration)
+        self.scheduler.after(settings.companion_shoot_interval, "companion", self.fire_companion)
+
+        # Remove the targeted obstacle
+        self.entities.remove([closest])
+        self.events.append("laser")
+        settings.score += 1  # Award a point for the destroyed obstacle
+
+    def start_storm(self):
+        settings = self.settings
+        settings.emoji_storm_active = True
+        self.events.append("storm")
+        self.scheduler.after(settings.emoji_storm_duration, "storm", self.end_storm)
+
+    def end_storm(self):
+        self.settings.emoji_storm_active = False
+        self.scheduler.after(self.settings.emoji_storm_trigger_time, "storm", self.start_storm)
+
+    # Wind comes in three steps on the one "wind" timer: the warning, the
+    # gust itself, and picking when the next one comes
+    def warn_wind(self):
+        settings = self.settings
+        settings.wind_warning_shown = True
+        settings.wind_direction = self.rng.choice([-1, 1])
+        self.scheduler.after(settings.wind_warning_duration, "wind", self.start_wind)
+
+    def start_wind(self):
+        settings = self.settings
+        settings.wind_warning_shown = False
+        settings.wind_active = True
+        self.events.append("wind")
+        self.scheduler.after(settings.wind_duration, "wind", self.end_wind)
+
+    def end_wind(self):
+        self.settings.wind_active = False
+        self.scheduler.after(self.rng.uniform(25, 40), "wind", self.warn_wind)
+
+    def update_spin_wheel(self, inputs):
+        settings = self.settings
+
+        if not settings.spin_wheel_active:
+            # SPACE brings up the wheel
+            if inputs & INPUT_SPIN:
+                settings.spin_wheel_active = True
+            return
+
+        if settings.spin_wheel_spinning:
+            # Follow the closed form rather than adding up speeds, so the
+            # wheel stops exactly where the outcome was predicted
+            settings.spin_wheel_ticks += 1
+            ticks = settings.spin_wheel_ticks
+            if settings.spin_wheel_stop_ticks is not None and ticks >= settings.spin_wheel_stop_ticks:
+                self.stop_spin_wheel()
+            else:
+                speed = settings.spin_wheel_start_speed
+                deceleration = settings.spin_wheel_deceleration
+                settings.spin_wheel_speed = speed - ticks * deceleration
+                settings.spin_wheel_angle = (settings.spin_wheel_start_angle + ticks * speed
+                                             - deceleration * ticks * (ticks + 1) / 2)
+        elif inputs & INPUT_SPIN and not settings.spin_wheel_result:
+            # Start spinning the wheel
+            speed = self.rng.uniform(10, 20)
+            settings.spin_wheel_spinning = True
+            settings.spin_wheel_speed = settings.spin_wheel_start_speed = speed
+            settings.spin_wheel_start_angle = settings.spin_wheel_angle
+            settings.spin_wheel_ticks = 0
+            settings.spin_start_time = self.time
+            self.events.append("spin")
+
+            settings.spin_wheel_stop_ticks = None
+            if settings.spin_wheel_deceleration > 0:
+                stop_ticks, turn = spin_wheel_stop(speed, settings.spin_wheel_deceleration)
+                settings.spin_wheel_stop_ticks = stop_ticks
+                settings.spin_wheel_outcome = settings.spin_wheel_options[
+                    spin_wheel_sector(settings.spin_wheel_start_angle + turn, len(settings.spin_wheel_options))]
+                if not settings.spin_wheel_animated:
+                    self.stop_spin_wheel()
+
+    def stop_spin_wheel(self):
+        settings = self.settings
+        stop_ticks, turn = spin_wheel_stop(settings.spin_wheel_start_speed, settings.spin_wheel_deceleration)
+        settings.spin_wheel_angle = settings.spin_wheel_start_angle + turn
+        settings.spin_wheel_speed = 0
+        settings.spin_wheel_spinning = False
+        settings.spin_wheel_result = settings.spin_wheel_outcome
+
+        # Handle result
+        if settings.spin_wheel_result == "Retry":
+            self.reset()
+        elif settings.spin_wheel_result == "Retry +1 Life":
+            self.reset(extra_life=True)
+        elif settings.spin_wheel_result == "Exit":
+            self.events.append("exit")
+
+    def check_combo(self):
+        settings = self.settings
+        if settings.combo_count >= settings.combo_threshold:
+            # Several obstacles can be dodged in the same tick
+            combos, settings.combo_count = divmod(settings.combo_count, settings.combo_threshold)
+            settings.score += settings.combo_bonus * combos
+            self.set_flag_for("show_combo", settings.combo_duration)
+            self.events.append("combo")
@@ -0,0 +1,125 @@
+import numpy as np
+
+# Entity kinds. Obstacle kinds come first so they index straight into the
+# obstacle emoji list; the powerups follow.
+NUM_OBSTACLE_KINDS = 5
+SAVIOR = 5
+FAKE_SAVIOR = 6
+SLOW_TIME = 7
+NUM_KINDS = 8
+
+
+# Pooled structure-of-arrays storage for everything that falls: obstacles,
+# saviors, fake saviors and slow time powerups. Slots are preallocated and
+# live entities are always packed into the first `count` slots, so the free
+# list is simply the tail of the arrays. Removing entities swaps the last
+# live ones into the holes, which moves at most as many entities as were
+# removed and never reallocates.
+class EntityPool:
+    def __init__(self, capacity=256):
+        self.x = np.zeros(capacity, dtype=np.float64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.kind = np.zeros(capacity, dtype=np.int8)
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self):
+        return len(self.x)
+
+    def clear(self):
+        self.count = 0
+
+    def spawn(self, x, y, kind):
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.kind[i] = kind
+        self.count += 1
+        return i
+
+    def _grow(self, capacity):
+        for name in ("x", "y", "kind"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    # Remove the entities at the given (unique) slot indices
+    def remove(self, indices):
+        indices = np.asarray(indices, dtype=np.intp)
+        removed = len(indices)
+        if not removed:
+            return
+        n = self.count
+        new_n = n - removed
+
+        # Holes below the new end get filled from the live slots past it
+        dead = np.zeros(n, dtype=bool)
+        dead[indices] = True
+        holes = indices[indices < new_n]
+        if len(holes):
+            movers = new_n + np.flatnonzero(~dead[new_n:])
+            for arr in (self.x, self.y, self.kind):
+                arr[holes] = arr[movers]
+        self.count = new_n
+
+    # Remove every entity whose entry in `dead` is True
+    def remove_mask(self, dead):
+        self.remove(np.flatnonzero(dead))
+
+    # Views of the live part of each array
+    def live(self):
+        n = self.count
+        return self.x[:n], self.y[:n], self.kind[:n]
+
+    # Boolean mask of live entities overlapping the given box, where `sizes`
+    # is either one size for all entities or an array with one per entity
+    def overlaps(self, sizes, box_x, box_y, box_w, box_h):
+        x, y, _ = self.live()
+        return ((y + sizes > box_y) & (y < box_y + box_h) &
+                (x + sizes > box_x) & (x < box_x + box_w))
+
+    # Swept version of overlaps(), see swept_overlap(). With `indices`, only
+    # those slots are tested and the mask is theirs.
+    def swept_overlaps(self, sizes, dx, dy, box_x, box_y, box_w, box_h, box_dx=0.0, box_dy=0.0,
+                       indices=None):
+        x, y, _ = self.live()
+        if indices is not None:
+            x, y = x[indices], y[indices]
+        return swept_overlap(x, y, sizes, dx, dy, box_x, box_y, box_w, box_h, box_dx, box_dy)
+
+
+# Swept AABB test for entities at (x, y) that moved by (dx, dy) this tick
+# while the box moved by (box_dx, box_dy). True for every entity that touched
+# the box at any point during the move, not just at the end of it, so a fast
+# entity can't tunnel through a box it jumped over. Positions are taken
+# relative to the box, which turns the test into a segment against the box
+# grown by the entity's size, solved per axis. Everything broadcasts, so the
+# same call works for one pool or a whole batch of games.
+def swept_overlap(x, y, sizes, dx, dy, box_x, box_y, box_w, box_h, box_dx=0.0, box_dy=0.0):
+    enter_x, exit_x = _slab(x - box_x, dx - box_dx, -sizes, box_w)
+    enter_y, exit_y = _slab(y - box_y, dy - box_dy, -sizes, box_h)
+    enter = np.maximum(enter_x, enter_y)
+    exit = np.minimum(exit_x, exit_y)
+    return (enter < exit) & (enter < 1) & (exit > 0)
+
+
+# Fraction of the move, as (enter, exit), during which a point that ended at
+# `end` after moving by `delta` lies strictly between `low` and `high`. The
+# move runs from 0 to 1; points that never moved are inside either for the
+# whole move or not at all.
+def _slab(end, delta, low, high):
+    start = end - delta
+    moving = delta != 0
+    safe_delta = np.where(moving, delta, 1.0)
+    t_low = (low - start) / safe_delta
+    t_high = (high - start) / safe_delta
+    inside = (start > low) & (start < high)
+    enter = np.where(moving, np.minimum(t_low, t_high), np.where(inside, -np.inf, np.inf))
+    exit = np.where(moving, np.maximum(t_low, t_high), np.where(inside, np.inf, -np.inf))
+    return enter, exit
@@ -0,0 +1,225 @@
+import numpy as np
+
+from batch_sim import BatchSimulator, WIND_BLOWING, WIND_WARNING
+from engine import GameEngine, GameSettings, SCREEN_WIDTH, SCREEN_HEIGHT, INPUT_LEFT, INPUT_RIGHT
+from entities import NUM_KINDS, NUM_OBSTACLE_KINDS, SAVIOR, FAKE_SAVIOR, SLOW_TIME
+from raster import RasterRenderer
+
+# Gym-style environments for training agents to dodge. Actions are
+# 0 = stay, 1 = left, 2 = right. The reward is the score gained on the step
+# (dodges, combos, laser kills) minus `hit_penalty` for every life lost, and
+# an episode ends at game over or after `max_steps` steps.
+#
+# Observations are either
+#   "features": a flat float32 vector (see FEATURES), or
+#   "raster":   {"raster": (3, rows, cols) grid of obstacles, power-ups
+#                and the player, "status": the first STATUS_FEATURES
+#                entries of the feature vector}
+#   "pixels":   {"pixels": (height, width) uint8 class ids from
+#                raster.RasterRenderer, "status": as above}. The frames
+#                live in the renderer's buffer and are overwritten by the
+#                next step, so copy them to keep them.
+# DodgeEnv runs one GameEngine; VecDodgeEnv steps any number of games in
+# one call on the batch simulator and restarts finished ones on its own.
+
+ACTIONS = np.array([0, INPUT_LEFT, INPUT_RIGHT], dtype=np.uint8)
+
+# Player x, lives, invincible, slow time, storm, wind direction while it
+# blows, wind warning, obstacle speed
+STATUS_FEATURES = 8
+NEAREST_OBSTACLES = 5
+POWERUP_KINDS = (SAVIOR, FAKE_SAVIOR, SLOW_TIME)
+POWERUP_COLUMN = np.zeros(NUM_KINDS, dtype=np.intp)
+POWERUP_COLUMN[list(POWERUP_KINDS)] = np.arange(len(POWERUP_KINDS))
+# Status, then (dx, dy) to the nearest obstacles, closest first, and to the
+# nearest power-up of each kind. Positions are relative to the player and
+# scaled by the screen size; missing entities read as one screen above.
+FEATURES = STATUS_FEATURES + 2 * NEAREST_OBSTACLES + 2 * len(POWERUP_KINDS)
+RASTER_SHAPE = (15, 20)
+PIXELS_SIZE = (80, 60)
+MISSING = (0.0, -1.0)
+
+
+def status_features(settings, player_x, lives, invincible, slow_time, storm, wind, warning, obstacle_speed):
+    status = np.empty((len(player_x), STATUS_FEATURES), dtype=np.float32)
+    status[:, 0] = player_x / (SCREEN_WIDTH - settings.player_size)
+    status[:, 1] = lives / settings.max_lives
+    status[:, 2] = invincible
+    status[:, 3] = slow_time
+    status[:, 4] = storm
+    status[:, 5] = wind
+    status[:, 6] = warning
+    status[:, 7] = obstacle_speed / 10
+    return status
+
+
+# (dx, dy) features for a batch of (games, slots) entity arrays
+def entity_features(x, y, kind, active, player_x, player_y):
+    k = NEAREST_OBSTACLES
+    if x.shape[1] < k:
+        # Pad with empty slots so there is always something to pick from
+        pad = ((0, 0), (0, k - x.shape[1]))
+        x, y, kind, active = np.pad(x, pad), np.pad(y, pad), np.pad(kind, pad), np.pad(active, pad)
+    rows = np.arange(len(x))[:, None]
+    dx = (x - player_x[:, None]) / SCREEN_WIDTH
+    dy = (y - player_y) / SCREEN_HEIGHT
+    dist = dx * dx + dy * dy
+    features = np.empty((len(x), FEATURES - STATUS_FEATURES), dtype=np.float32)
+
+    # Nearest obstacles, closest first
+    obstacle = active & (kind < NUM_OBSTACLE_KINDS)
+    obstacle_dist = np.where(obstacle, dist, np.inf)
+    nearest = np.argpartition(obstacle_dist, k - 1, axis=1)[:, :k]
+    nearest = np.take_along_axis(nearest, np.argsort(obstacle_dist[rows, nearest], axis=1), axis=1)
+    found = np.isfinite(obstacle_dist[rows, nearest])
+    features[:, 0:2 * k:2] = np.where(found, dx[rows, nearest], MISSING[0])
+    features[:, 1:2 * k:2] = np.where(found, dy[rows, nearest], MISSING[1])
+
+    # Nearest power-up of each kind. There are only ever a few on screen, so
+    # sort the live ones by game, kind and distance and keep the first of
+    # each (game, kind) run.
+    features[:, 2 * k::2] = MISSING[0]
+    features[:, 2 * k + 1::2] = MISSING[1]
+    game, slot = np.nonzero(active & ~obstacle)
+    powerup = kind[game, slot]
+    order = np.lexsort((dist[game, slot], powerup, game))
+    game, slot, powerup = game[order], slot[order], powerup[order]
+    first = np.ones(len(game), dtype=bool)
+    first[1:] = (game[1:] != game[:-1]) | (powerup[1:] != powerup[:-1])
+    game, slot = game[first], slot[first]
+    column = 2 * k + 2 * POWERUP_COLUMN[powerup[first]]
+    features[game, column] = dx[game, slot]
+    features[game, column + 1] = dy[game, slot]
+    return features
+
+
+# Downsampled playfield: channel 0 counts obstacles per cell, channel 1 is
+# +1 for a savior or slow time and -1 for a fake savior, channel 2 marks the
+# player. Entities are placed by their centre.
+def raster(settings, x, y, kind, active, player_x, player_y, shape=RASTER_SHAPE):
+    games = len(player_x)
+    rows, cols = shape
+    grid = np.zeros((games, 3, rows, cols), dtype=np.float32)
+    half = settings.obstacle_size / 2
+    on_screen = active & (y + half >= 0) & (y + half < SCREEN_HEIGHT)
+    game, slot = np.nonzero(on_screen)
+    entity_kind = kind[game, slot]
+    row = ((y[game, slot] + half) * (rows / SCREEN_HEIGHT)).astype(np.intp)
+    col = np.clip(((x[game, slot] + half) * (cols / SCREEN_WIDTH)).astype(np.intp), 0, cols - 1)
+    is_obstacle = entity_kind < NUM_OBSTACLE_KINDS
+    np.add.at(grid, (game[is_obstacle], 0, row[is_obstacle], col[is_obstacle]), 1.0)
+    powerup = ~is_obstacle
+    value = np.where(entity_kind[powerup] == FAKE_SAVIOR, -1.0, 1.0).astype(np.float32)
+    grid[game[powerup], 1, row[powerup], col[powerup]] = value
+
+    player_half = settings.player_size / 2
+    player_row = min(int((player_y + player_half) * rows / SCREEN_HEIGHT), rows - 1)
+    player_col = np.clip(((player_x + player_half) * (cols / SCREEN_WIDTH)).astype(np.intp), 0, cols - 1)
+    grid[np.arange(games), 2, player_row, player_col] = 1.0
+    return grid
+
+
+class DodgeEnv:
+    def __init__(self, settings=None, observation="features", hit_penalty=50, max_steps=None):
+        self.settings = settings or GameSettings()
+        self.observation = observation
+        self.hit_penalty = hit_penalty
+        self.max_steps = max_steps
+        self.engine = None
+        self.steps = 0
+        if observation == "pixels":
+            self.renderer = RasterRenderer(self.settings, *PIXELS_SIZE)
+
+    def reset(self, seed=None):
+        self.engine = GameEngine(self.settings, seed)
+        self.steps = 0
+        return self._observe()
+
+    def step(self, action):
+        engine = self.engine
+        settings = engine.settings
+        score, lives = settings.score, settings.lives
+        engine.step(ACTIONS[action])
+        self.steps += 1
+
+        reward = settings.score - score - self.hit_penalty * max(lives - settings.lives, 0)
+        done = settings.game_over or (self.max_steps is not None and self.steps >= self.max_steps)
+        info = {"score": settings.score, "survival_score": settings.survival_score}
+        return self._observe(), float(reward), done, info
+
+    def _observe(self):
+        engine = self.engine
+        settings = engine.settings
+        x, y, kind = engine.entities.live()
+        x, y, kind = x[None], y[None], kind[None]
+        active = np.ones(x.shape, dtype=bool)
+        player_x = np.array([float(engine.player_x)])
+        wind = settings.wind_direction if settings.wind_active else 0
+        status = status_features(settings, player_x, settings.lives, settings.is_invincible,
+                                 settings.slow_time_active, settings.emoji_storm_active, wind,
+                                 settings.wind_warning_shown, settings.obstacle_speed)
+        if self.observation == "raster":
+            return {"raster": raster(settings, x, y, kind, active, player_x, engine.player_y)[0],
+                    "status": status[0]}
+        if self.observation == "pixels":
+            return {"pixels": self.renderer.render_engine(engine), "status": status[0]}
+        features = entity_features(x, y, kind, active, player_x, engine.player_y)
+        return np.concatenate([status, features], axis=1)[0]
+
+
+class VecDodgeEnv:
+    def __init__(self, num_envs, settings=None, observation="features", hit_penalty=50, max_steps=None, seed=None):
+        self.num_envs = num_envs
+        self.settings = settings or GameSettings()
+        self.observation = observation
+        self.hit_penalty = hit_penalty
+        self.max_steps = max_steps
+        self.sim = BatchSimulator(num_envs, self.settings, seed)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        if observation == "pixels":
+            self.renderer = RasterRenderer(self.settings, *PIXELS_SIZE, batch=num_envs)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.sim = BatchSimulator(self.num_envs, self.settings, seed)
+        else:
+            self.sim.reset_games(np.arange(self.num_envs))
+        self.steps[:] = 0
+        return self._observe()
+
+    # Step every env. Finished envs are restarted straight away, so their
+    # observation is the first one of the next episode; `info` holds the
+    # final score and survival score of the episodes that just ended.
+    def step(self, actions):
+        sim = self.sim
+        score, lives = sim.score.copy(), sim.lives.copy()
+        sim.step(ACTIONS[actions])
+        self.steps += 1
+
+        rewards = (sim.score - score - self.hit_penalty * np.maximum(lives - sim.lives, 0)).astype(np.float32)
+        dones = sim.lives <= 0
+        if self.max_steps is not None:
+            dones |= self.steps >= self.max_steps
+        info = {"score": np.where(dones, sim.score, 0), "survival_score": np.where(dones, sim.survival_score, 0)}
+
+        finished = np.flatnonzero(dones)
+        if len(finished):
+            sim.reset_games(finished)
+            self.steps[finished] = 0
+        return self._observe(), rewards, dones, info
+
+    def _observe(self):
+        sim = self.sim
+        settings = self.settings
+        status = status_features(settings, sim.player_x, sim.lives, sim.invincible_until > sim.now,
+                                 sim.slow_time_until > sim.now, sim.storm_active,
+                                 np.where(sim.wind_phase == WIND_BLOWING, sim.wind_direction, 0.0),
+                                 sim.wind_phase == WIND_WARNING, sim.obstacle_speed)
+        if self.observation == "raster":
+            return {"raster": raster(settings, sim.x, sim.y, sim.kind, sim.active, sim.player_x, sim.player_y),
+                    "status": status}
+        if self.observation == "pixels":
+            return {"pixels": self.renderer.render(sim.x, sim.y, sim.kind, sim.active, sim.player_x, sim.player_y),
+                    "status": status}
+        features = entity_features(sim.x, sim.y, sim.kind, sim.active, sim.player_x, sim.player_y)
+        return np.concatenate([status, features], axis=1)
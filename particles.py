@@ -0,0 +1,191 @@
+import numpy as np
+import pygame
+
+# Particle styles: colour and the pixels each particle covers, as offsets
+# from its position
+WIND_STREAK = 0
+STORM_SPARK = 1
+HIT_BURST = 2
+STYLES = [
+    ((200, 200, 255), [(dx, 0) for dx in range(12)]),          # horizontal streak
+    ((255, 200, 40), [(0, dy) for dy in range(3)]),            # short falling spark
+    ((255, 80, 60), [(0, 0), (1, 0), (0, 1), (1, 1)]),         # 2x2 fleck
+]
+
+# Particles fade out over their life in this many steps
+FADE_LEVELS = 4
+
+# draw() reports what it touched as one rect per occupied cell of this size,
+# so a few particles at opposite ends of the screen don't dirty all of it
+CELL_SIZE = 64
+
+# Transparent colour of the sprites used on surfaces that aren't 32-bit
+COLORKEY = (255, 0, 255)
+
+
+# Fixed-capacity particle pool kept as NumPy arrays, so a frame is a handful
+# of vectorised operations whatever the number of particles: update() moves
+# everything and compacts out the dead, draw() writes every particle's pixels
+# straight into a 32-bit surface with one array assignment per style. Other
+# depths get a blit per particle instead. Emitting into a full pool drops
+# the new particles.
+#
+# Particles are drawn in solid colours, faded by blending towards the
+# background colour, which is much cheaper than per-pixel alpha and looks
+# the same over the plain sky.
+class ParticleSystem:
+    def __init__(self, capacity=4096, styles=STYLES):
+        self.capacity = capacity
+        self.count = 0
+        self.dropped = 0
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.lifetime = np.ones(capacity, dtype=np.float32)
+        self.style = np.zeros(capacity, dtype=np.uint8)
+
+        self.colors = np.array([color for color, _ in styles], dtype=np.float32)
+        self.offsets = [np.array(offsets, dtype=np.intp) for _, offsets in styles]
+        self.reach = max(int(np.abs(offsets).max()) for offsets in self.offsets) + 1
+        self._mapped = {}
+        self._sprite_cache = {}
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    # Add particles; any argument can be an array (one value per particle)
+    # or a scalar shared by all of them. Returns how many fitted.
+    def emit(self, x, y, vx, vy, lifetime, style):
+        x, y, vx, vy, lifetime = np.broadcast_arrays(*np.atleast_1d(x, y, vx, vy, lifetime))
+        n = min(len(x), self.capacity - self.count)
+        self.dropped += len(x) - n
+        new = slice(self.count, self.count + n)
+        self.x[new] = x[:n]
+        self.y[new] = y[:n]
+        self.vx[new] = vx[:n]
+        self.vy[new] = vy[:n]
+        self.life[new] = lifetime[:n]
+        self.lifetime[new] = lifetime[:n]
+        self.style[new] = style
+        self.count += n
+        return n
+
+    # Advance `dt` seconds and drop the particles that ran out of life or
+    # left `bounds` (a Rect)
+    def update(self, dt, bounds=None):
+        n = self.count
+        if not n:
+            return
+        x, y, life = self.x[:n], self.y[:n], self.life[:n]
+        x += self.vx[:n] * dt
+        y += self.vy[:n] * dt
+        life -= dt
+
+        alive = life > 0
+        if bounds is not None:
+            alive &= (x >= bounds.left) & (x < bounds.right) & (y >= bounds.top) & (y < bounds.bottom)
+        kept = int(np.count_nonzero(alive))
+        if kept < n:
+            for array in (self.x, self.y, self.vx, self.vy, self.life, self.lifetime, self.style):
+                array[:kept] = array[:n][alive]
+            self.count = kept
+
+    # Every (style, fade level) colour blended over `background`, as RGB
+    def _blended(self, background):
+        weights = (np.arange(FADE_LEVELS, dtype=np.float32) + 1) / FADE_LEVELS
+        blended = (np.array(background, dtype=np.float32) * (1 - weights[None, :, None])
+                   + self.colors[:, None, :] * weights[None, :, None])
+        return [[tuple(int(c) for c in color) for color in style] for style in blended.round()]
+
+    # Mapped pixel values for every (style, fade level) over `background`
+    def _colors(self, surface, background):
+        key = (background, surface.get_bitsize())
+        mapped = self._mapped.get(key)
+        if mapped is None:
+            mapped = np.array([[surface.map_rgb(color) for color in style]
+                               for style in self._blended(background)], dtype=np.uint32)
+            self._mapped[key] = mapped
+        return mapped
+
+    # Small colour-keyed sprite for every (style, fade level) over
+    # `background`, with the offset to blit it at
+    def _sprites(self, background):
+        sprites = self._sprite_cache.get(background)
+        if sprites is None:
+            sprites = []
+            for offsets, colors in zip(self.offsets, self._blended(background)):
+                origin = offsets.min(axis=0)
+                size = offsets.max(axis=0) - origin + 1
+                style = []
+                for color in colors:
+                    sprite = pygame.Surface((int(size[0]), int(size[1])))
+                    sprite.fill(COLORKEY)
+                    sprite.set_colorkey(COLORKEY)
+                    for dx, dy in (offsets - origin).tolist():
+                        sprite.set_at((dx, dy), color)
+                    style.append(sprite)
+                sprites.append((style, origin.tolist()))
+            self._sprite_cache[background] = sprites
+        return sprites
+
+    # Draw onto `surface`; returns rects covering every particle drawn, made
+    # up of the CELL_SIZE cells they're in
+    def draw(self, surface, background):
+        n = self.count
+        if not n:
+            return []
+        width, height = surface.get_size()
+        level = np.ceil(self.life[:n] / self.lifetime[:n] * FADE_LEVELS).astype(np.intp) - 1
+        np.clip(level, 0, FADE_LEVELS - 1, out=level)
+        px = self.x[:n].astype(np.intp)
+        py = self.y[:n].astype(np.intp)
+        style = self.style[:n]
+
+        if surface.get_bitsize() == 32:
+            self._draw_pixels(surface, background, px, py, style, level)
+        else:
+            # pixels2d can't hand out arrays of other depths
+            sprites = self._sprites(background)
+            surface.blits([(sprites[s][0][lvl], (x + sprites[s][1][0], y + sprites[s][1][1]))
+                           for s, lvl, x, y in zip(style.tolist(), level.tolist(), px.tolist(), py.tolist())],
+                          doreturn=False)
+
+        # One rect per run of occupied cells along a row, grown by `reach` as
+        # a particle draws up to that many pixels right of and below itself
+        columns = (width + CELL_SIZE - 1) // CELL_SIZE
+        rows = (height + CELL_SIZE - 1) // CELL_SIZE
+        cell_x = np.minimum(np.maximum(px, 0), width - 1) // CELL_SIZE
+        cell_y = np.minimum(np.maximum(py, 0), height - 1) // CELL_SIZE
+        # Each row starts with an empty column, so flattened runs never wrap
+        occupied = np.zeros((rows, columns + 1), dtype=np.int8)
+        occupied[cell_y, cell_x + 1] = 1
+        edges = np.diff(occupied, axis=1, append=0).ravel()
+        starts = np.flatnonzero(edges == 1).tolist()
+        ends = np.flatnonzero(edges == -1).tolist()
+        bounds = pygame.Rect(0, 0, width, height)
+        stride = columns + 1
+        return [pygame.Rect(start % stride * CELL_SIZE, start // stride * CELL_SIZE,
+                            (end - start) * CELL_SIZE + self.reach, CELL_SIZE + self.reach).clip(bounds)
+                for start, end in zip(starts, ends)]
+
+    def _draw_pixels(self, surface, background, px, py, style, level):
+        width, height = surface.get_size()
+        colors = self._colors(surface, background)
+        pixels = pygame.surfarray.pixels2d(surface)
+        try:
+            for index, offsets in enumerate(self.offsets):
+                members = np.flatnonzero(style == index)
+                if not len(members):
+                    continue
+                cols = (px[members, None] + offsets[:, 0]).ravel()
+                rows = (py[members, None] + offsets[:, 1]).ravel()
+                values = np.repeat(colors[index, level[members]], len(offsets))
+                inside = (cols >= 0) & (cols < width) & (rows >= 0) & (rows < height)
+                pixels[cols[inside], rows[inside]] = values[inside]
+        finally:
+            del pixels
@@ -0,0 +1,171 @@
+import csv
+import json
+import time
+from array import array
+from collections import deque
+from itertools import islice
+
+import numpy as np
+
+
+def _percentiles(frames):
+    if not len(frames):
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    p50, p95, p99 = np.percentile(frames, [50, 95, 99])
+    return {"p50": float(p50), "p95": float(p95), "p99": float(p99)}
+
+
+class _Phase:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.start)
+
+
+# Frame-time profiler. The main loop brackets each phase of a frame with
+# `with profiler.phase(name):`, engine methods can be timed in place with
+# instrument(), and every finished frame becomes one sample: the time since
+# the previous frame started plus the milliseconds spent in each phase.
+# Methods instrumented inside one of the loop's phases are recorded as its
+# sub-phases, named "parent/phase", so the top-level phases never count the
+# same time twice.
+#
+# Only the overlay's windows are kept in memory: `graph_frames` frame times
+# and the last `recent_frames` samples. To keep a whole session, record()
+# writes every sample to a file as its frame finishes.
+class FrameProfiler:
+    def __init__(self, graph_frames=240, recent_frames=60):
+        self.visible = False
+        self.frame_times = deque(maxlen=graph_frames)
+        self.samples = deque(maxlen=recent_frames)
+        self.phase_names = []
+        self.sub_phase_names = set()
+        self._phases = {}
+        self._nested = []
+        self._frame_start = None
+        self._out = None
+        self._writer = None
+        self._columns = None
+        self._recorded_frames = None
+
+    def begin_frame(self):
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            frame_ms = (now - self._frame_start) * 1000
+            self.frame_times.append(frame_ms)
+            sample = {name: seconds * 1000 for name, seconds in self._phases.items()}
+            sample["frame"] = frame_ms
+            self.samples.append(sample)
+            if self._out:
+                self._write(sample)
+        self._frame_start = now
+        self._phases = {}
+
+    def phase(self, name):
+        return _Phase(self, name)
+
+    def add(self, name, seconds):
+        if name not in self._phases:
+            self._phases[name] = 0.0
+            self._register(name)
+        self._phases[name] += seconds
+
+    def _register(self, name):
+        if name not in self.phase_names:
+            self.phase_names.append(name)
+
+    # Wrap methods of `obj` so their time is added to a phase. `phases` maps
+    # method names to phase names; several methods may share one phase. A
+    # method only gets its own time, less that of the instrumented methods
+    # it calls, so the phases never overlap each other. With `parent` they're
+    # sub-phases of the phase the methods run inside.
+    def instrument(self, obj, phases, parent=None):
+        for method_name, phase_name in phases.items():
+            method = getattr(obj, method_name)
+            if parent:
+                phase_name = f"{parent}/{phase_name}"
+                self.sub_phase_names.add(phase_name)
+            self._register(phase_name)
+
+            def timed(*args, _method=method, _phase=phase_name):
+                nested = self._nested
+                nested.append(0.0)
+                start = time.perf_counter()
+                try:
+                    return _method(*args)
+                finally:
+                    elapsed = time.perf_counter() - start
+                    inner = nested.pop()
+                    if nested:
+                        nested[-1] += elapsed
+                    self.add(_phase, elapsed - inner)
+            setattr(obj, method_name, timed)
+
+    # p50/p95/p99 of the frame time over the graph's rolling window, in ms.
+    # The overlay asks every frame, so this never touches the full history.
+    def percentiles(self):
+        return _percentiles(np.fromiter(self.frame_times, dtype=np.float64, count=len(self.frame_times)))
+
+    # Average milliseconds per frame spent in each top-level phase, and with
+    # `sub_phases` each sub-phase as well, over the last `frames` frames
+    def phase_averages(self, frames=60, sub_phases=False):
+        recent = list(islice(reversed(self.samples), frames))
+        if not recent:
+            return {}
+        return {name: sum(sample.get(name, 0.0) for sample in recent) / len(recent)
+                for name in self.phase_names if sub_phases or name not in self.sub_phase_names}
+
+    # Write every frame from here on to `path`, as CSV or (for .json) JSON
+    # with a percentile summary over the whole recording, added by close().
+    # The columns are fixed when the first frame is written, so every phase
+    # has to have run or been instrumented by then. Sub-phase columns keep
+    # their "parent/" prefix, and the JSON lists them under "sub_phases":
+    # their time is already in the parent's column, so only the others add up.
+    def record(self, path):
+        self._out = open(path, "w", newline="")
+        self._columns = None
+        if path.endswith(".json"):
+            self._recorded_frames = array("d")
+
+    def _write(self, sample):
+        out = self._out
+        if self._columns is None:
+            self._columns = ["frame"] + self.phase_names
+            if self._recorded_frames is None:
+                self._writer = csv.writer(out)
+                self._writer.writerow([name + "_ms" for name in self._columns])
+            else:
+                out.write(f'{{"columns": {json.dumps(self._columns)}, "sub_phases": '
+                          f'{json.dumps([name for name in self._columns if name in self.sub_phase_names])}, '
+                          f'"samples": [')
+        late = [name for name in sample if name not in self._columns]
+        if late:
+            raise ValueError(f"phases {late} first ran after the profile's columns were written")
+
+        if self._recorded_frames is None:
+            self._writer.writerow([f"{sample.get(name, 0.0):.4f}" for name in self._columns])
+        else:
+            if self._recorded_frames:
+                out.write(", ")
+            out.write(json.dumps([round(sample.get(name, 0.0), 4) for name in self._columns]))
+            self._recorded_frames.append(sample["frame"])
+
+    # Finish and close the file record() opened
+    def close(self):
+        out = self._out
+        if out is None:
+            return
+        if self._recorded_frames is not None:
+            if self._columns is None:
+                out.write('{"columns": [], "sub_phases": [], "samples": [')
+            frames = np.frombuffer(self._recorded_frames, dtype=np.float64)
+            out.write(f'], "summary": {json.dumps(_percentiles(frames))}}}')
+        out.close()
+        self._out = None
@@ -0,0 +1,109 @@
+import numpy as np
+
+from engine import SCREEN_WIDTH, SCREEN_HEIGHT
+from entities import NUM_KINDS, NUM_OBSTACLE_KINDS
+
+# Paints the playfield straight into a preallocated NumPy array, as one
+# class id or colour per pixel, without going through fonts or surfaces.
+# Used for agent observations and for screenshot tests that shouldn't depend
+# on the emoji font being installed. Every entity is a filled box the size
+# of its hitbox, and where boxes overlap the one painted last wins. The
+# player goes first, then the companion, then the falling entities one
+# hitbox size at a time, smallest first, in pool slot order within a size.
+# With the default settings obstacles and power-ups are the same size, so
+# that's plain slot order, and entities always cover the player.
+#
+# Entity kinds keep their number shifted up by one so 0 can be the
+# background.
+BACKGROUND = 0
+PLAYER = NUM_KINDS + 1
+COMPANION = NUM_KINDS + 2
+NUM_CLASSES = NUM_KINDS + 3
+
+# Class id -> RGB for colour frames, roughly the emoji colours
+PALETTE = np.array([
+    (100, 149, 237),  # background (day sky)
+    (255, 110, 0),    # 🔥
+    (40, 40, 40),     # 💣
+    (128, 128, 128),  # 🪨
+    (255, 230, 0),    # ⚡
+    (170, 170, 190),  # 🌪️
+    (255, 215, 0),    # 🛡️ savior
+    (255, 0, 0),      # 💔 fake savior
+    (128, 0, 128),    # ⏳ slow time
+    (255, 204, 77),   # player
+    (192, 192, 192),  # 🤖 companion
+], dtype=np.uint8)
+
+
+class RasterRenderer:
+    # `batch` frames of width x height pixels are drawn per call; the
+    # playfield is scaled to fit. With `colours` the frames are RGB from
+    # `palette` instead of class ids.
+    def __init__(self, settings, width=SCREEN_WIDTH, height=SCREEN_HEIGHT, batch=1, colours=False,
+                 palette=PALETTE):
+        self.settings = settings
+        self.width = width
+        self.height = height
+        self.scale_x = width / SCREEN_WIDTH
+        self.scale_y = height / SCREEN_HEIGHT
+        self.kind_size = np.where(np.arange(NUM_KINDS) < NUM_OBSTACLE_KINDS,
+                                  settings.obstacle_size, settings.powerup_size)
+        self.sizes = np.unique(self.kind_size).tolist()
+
+        # Boxes are clamped into a margin as wide as the biggest box, so
+        # anything off screen lands entirely in the margin and painting never
+        # needs a bounds check. `frames` is the visible part.
+        largest = max(settings.player_size, settings.obstacle_size, settings.powerup_size)
+        self.margin = m = int(np.ceil(largest * max(self.scale_x, self.scale_y))) + 1
+        shape = (batch, height + 2 * m, width + 2 * m)
+        if colours:
+            # Paint whole pixels as little-endian RGBX words and hand out the
+            # bytes, which is much cheaper than mapping ids through the
+            # palette afterwards
+            palette = np.asarray(palette, dtype=np.uint32)
+            self.values = (palette[:, 0] | palette[:, 1] << 8 | palette[:, 2] << 16).astype("<u4")
+            self._padded = np.zeros(shape, dtype="<u4")
+            pixels = self._padded.view(np.uint8).reshape(shape + (4,))
+            self.frames = pixels[:, m:m + height, m:m + width, :3]
+        else:
+            self.values = np.arange(NUM_CLASSES, dtype=np.uint8)
+            self._padded = np.zeros(shape, dtype=np.uint8)
+            self.frames = self._padded[:, m:m + height, m:m + width]
+
+    # Fill size x size boxes with top-left corners at (x, y) in frame `frame`
+    def _paint(self, frame, x, y, size, class_id):
+        m = self.margin
+        box_w = max(int(round(size * self.scale_x)), 1)
+        box_h = max(int(round(size * self.scale_y)), 1)
+        cols = np.clip(np.floor(x * self.scale_x).astype(np.intp), -m, self.width) + m
+        rows = np.clip(np.floor(y * self.scale_y).astype(np.intp), -m, self.height) + m
+        cols = cols[:, None, None] + np.arange(box_w)
+        rows = rows[:, None, None] + np.arange(box_h)[:, None]
+        self._padded[frame[:, None, None], rows, cols] = self.values[class_id, None, None]
+
+    # Draw a batch of games given (games, slots) entity arrays like the
+    # batch simulator's, and return the frames
+    def render(self, x, y, kind, active, player_x, player_y):
+        settings = self.settings
+        self._padded.fill(self.values[BACKGROUND])
+        frames = np.arange(len(player_x))
+        self._paint(frames, player_x, np.full(len(frames), player_y), settings.player_size, PLAYER)
+        if settings.companion_active:
+            self._paint(frames, player_x - settings.companion_offset_x,
+                        np.full(len(frames), player_y + settings.companion_offset_y),
+                        settings.obstacle_size, COMPANION)
+
+        frame, slot = np.nonzero(active)
+        kinds = kind[frame, slot]
+        for size in self.sizes:
+            same = self.kind_size[kinds] == size
+            self._paint(frame[same], x[frame, slot][same], y[frame, slot][same], size, kinds[same] + 1)
+        return self.frames
+
+    # One headless GameEngine into frame 0
+    def render_engine(self, engine):
+        x, y, kind = engine.entities.live()
+        self.render(x[None], y[None], kind[None], np.ones((1, len(kind)), dtype=bool),
+                    np.array([float(engine.player_x)]), engine.player_y)
+        return self.frames[0]
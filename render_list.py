@@ -0,0 +1,24 @@
+# Per-layer lists of (surface, position) pairs. Draw code queues sprites
+# with add()/extend() instead of blitting them one at a time, and each layer
+# then goes to the screen in a single Surface.blits call, so the cost of a
+# crowded screen is mostly spent in SDL rather than in the interpreter.
+class RenderList:
+    def __init__(self, layers):
+        self.layers = {name: [] for name in layers}
+
+    def add(self, layer, surface, pos):
+        self.layers[layer].append((surface, pos))
+
+    def extend(self, layer, items):
+        self.layers[layer].extend(items)
+
+    def clear(self):
+        for items in self.layers.values():
+            items.clear()
+
+    # Blit everything queued on `layer` through the renderer and empty it
+    def draw(self, renderer, layer):
+        items = self.layers[layer]
+        if items:
+            renderer.blits(items)
+            items.clear()
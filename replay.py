@@ -0,0 +1,116 @@
+import argparse
+import struct
+import zlib
+
+from engine import GameEngine
+
+# Replay file layout: a fixed header followed by the zlib-compressed input
+# bitmask of every tick, one byte per tick. Held keys repeat for many ticks
+# in a row, so the input stream compresses to a few bytes per second of play.
+MAGIC = b"EDRP"
+VERSION = 3  # bumped whenever a rule change makes old replays play out differently
+HEADER = struct.Struct("<4sHQIqq")  # magic, version, seed, ticks, score, survival score
+MAX_SEED = 2 ** 64 - 1  # the header keeps the seed as an unsigned 64-bit number
+
+
+class ReplayError(Exception):
+    pass
+
+
+# argparse type for seeds, so one the header can't hold is refused up front
+# rather than when the replay is saved at the end of the game
+def seed_arg(text):
+    try:
+        seed = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid seed: {text!r}")
+    if not 0 <= seed <= MAX_SEED:
+        raise argparse.ArgumentTypeError(f"seed must be between 0 and {MAX_SEED}")
+    return seed
+
+
+class Replay:
+    def __init__(self, seed, inputs, score=None, survival_score=None):
+        self.seed = seed
+        self.inputs = bytes(inputs)
+        self.score = score
+        self.survival_score = survival_score
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def save(self, path):
+        header = HEADER.pack(MAGIC, VERSION, self.seed, len(self.inputs),
+                             self.score, self.survival_score)
+        with open(path, "wb") as f:
+            f.write(header)
+            f.write(zlib.compress(self.inputs, 9))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ReplayError(f"{path}: file too short")
+        magic, version, seed, ticks, score, survival_score = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ReplayError(f"{path}: not a replay file")
+        if version != VERSION:
+            raise ReplayError(f"{path}: unsupported replay version {version}")
+        inputs = zlib.decompress(data[HEADER.size:])
+        if len(inputs) != ticks:
+            raise ReplayError(f"{path}: expected {ticks} ticks, found {len(inputs)}")
+        return cls(seed, inputs, score, survival_score)
+
+
+# Records the inputs fed to an engine, one per step
+class ReplayRecorder:
+    def __init__(self, engine):
+        self.engine = engine
+        self.inputs = bytearray()
+
+    def step(self, inputs):
+        self.inputs.append(inputs)
+        self.engine.step(inputs)
+
+    def replay(self):
+        settings = self.engine.settings
+        return Replay(self.engine.seed, self.inputs, settings.score, settings.survival_score)
+
+
+# Re-simulate a replay headlessly, as fast as the CPU allows, and return the
+# engine in its final state
+def play(replay, settings=None):
+    engine = GameEngine(settings, seed=replay.seed)
+    for inputs in replay.inputs:
+        engine.step(inputs)
+    return engine
+
+
+# Re-simulate a replay and check it ends on the recorded scores. Returns
+# whether it did, and the engine in its final state.
+def verify(replay, settings=None):
+    engine = play(replay, settings)
+    ok = (engine.settings.score == replay.score and
+          engine.settings.survival_score == replay.survival_score)
+    return ok, engine
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-simulate and verify an Emoji Dodge replay")
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.path)
+    ok, engine = verify(replay)
+    settings = engine.settings
+
+    print(f"seed {replay.seed}, {len(replay)} ticks")
+    print(f"recorded: score {replay.score}, survival score {replay.survival_score}")
+    print(f"replayed: score {settings.score}, survival score {settings.survival_score}")
+    print("OK" if ok else "MISMATCH")
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
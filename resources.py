@@ -0,0 +1,122 @@
+from collections import OrderedDict
+
+import pygame
+
+
+# Cache of rendered text surfaces keyed by (text, font, colour). Rasterising
+# text is the most expensive thing the HUD does, and most of its strings only
+# change once a second, so each distinct string is rendered once and reused
+# until it falls out of the least-recently-used end of the cache.
+class TextCache:
+    def __init__(self, max_size=256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._surfaces = OrderedDict()
+
+    def __len__(self):
+        return len(self._surfaces)
+
+    def clear(self):
+        self._surfaces.clear()
+
+    def render(self, font, text, color):
+        key = (text, font, color)
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._surfaces[key] = surface
+        if len(self._surfaces) > self.max_size:
+            self._surfaces.popitem(last=False)
+        return surface
+
+    # Draw `label` followed by `value`. The label is cached as a whole while
+    # the value is put together from cached single glyphs, so counters that
+    # change every frame never hit the font renderer. Returns the area drawn.
+    def blit_label(self, target, font, color, pos, label, value):
+        x, y = pos
+        surface = self.render(font, label, color)
+        rect = target.blit(surface, (x, y))
+        x += surface.get_width()
+        for char in value:
+            glyph = self.render(font, char, color)
+            rect.union_ip(target.blit(glyph, (x, y)))
+            x += glyph.get_width()
+        return rect
+
+
+# Solid translucent surfaces (HUD panels, the game over overlay) built once
+# per size and colour and converted to the display format. Changing the alpha
+# reuses the same surface, so fades don't allocate a new one every frame.
+class PanelCache:
+    def __init__(self):
+        self._panels = {}
+
+    def clear(self):
+        # Call after the display mode changes so panels get rebuilt
+        self._panels.clear()
+
+    def get(self, size, color, alpha):
+        key = (size, color)
+        panel = self._panels.get(key)
+        if panel is None:
+            panel = pygame.Surface(size)
+            if pygame.display.get_surface() is not None:
+                panel = panel.convert()
+            panel.fill(color)
+            self._panels[key] = panel
+        if panel.get_alpha() != alpha:
+            panel.set_alpha(alpha)
+        return panel
+
+
+# Rotated copies of a surface in fixed steps, made on first use. Smooth
+# rotation is far too slow to redo every frame, but a spinning wheel only
+# ever needs 360 / step distinct images. Each copy of the wheel is a few
+# hundred KB, so the step is coarse, the least recently used copies go once
+# there are `max_size`, and clear() drops the lot when the wheel goes away.
+class RotationCache:
+    def __init__(self, surface, step=8, max_size=48):
+        self.surface = surface
+        self.step = step
+        self.max_size = max_size
+        self._rotations = OrderedDict()
+        self._exact = None
+
+    def __len__(self):
+        return len(self._rotations)
+
+    def clear(self):
+        self._rotations.clear()
+        self._exact = None
+
+    def _rotate(self, angle):
+        rotated = pygame.transform.rotozoom(self.surface, angle, 1)
+        if pygame.display.get_surface() is not None:
+            rotated = rotated.convert_alpha()
+        return rotated
+
+    # `surface` turned `angle` degrees anticlockwise, to the nearest step
+    def get(self, angle):
+        index = round(angle / self.step) % round(360 / self.step)
+        rotated = self._rotations.get(index)
+        if rotated is None:
+            rotated = self._rotate(index * self.step)
+            self._rotations[index] = rotated
+            if len(self._rotations) > self.max_size:
+                self._rotations.popitem(last=False)
+        else:
+            self._rotations.move_to_end(index)
+        return rotated
+
+    # `surface` turned exactly `angle` degrees, for something standing still
+    # where a step's worth of error would show. Only the latest is kept.
+    def exact(self, angle):
+        if self._exact is None or self._exact[0] != angle:
+            self._exact = (angle, self._rotate(angle))
+        return self._exact[1]
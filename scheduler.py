@@ -0,0 +1,76 @@
+import heapq
+
+
+# Timers in simulation time, kept in a heap ordered by when they're due.
+# Every timer has a name; scheduling a name that is already pending replaces
+# it, which is how effects like invincibility restart on every hit. run()
+# only ever looks at the head of the heap, so a tick where nothing is due
+# costs one comparison however many timers are waiting.
+#
+# Replaced and cancelled timers are left in the heap and skipped when they
+# come up, rather than searched for and removed.
+class Scheduler:
+    def __init__(self):
+        self.time = 0.0
+        self._heap = []
+        self._timers = {}
+        self._sequence = 0
+
+    def __len__(self):
+        return len(self._timers)
+
+    def clear(self):
+        self._heap.clear()
+        self._timers.clear()
+
+    # Call `callback()` at simulation time `due`, and then every `interval`
+    # seconds after that if one is given
+    def at(self, due, name, callback, interval=None):
+        self.cancel(name)
+        # Ties fire in the order they were scheduled
+        self._sequence += 1
+        timer = [due, self._sequence, name, callback, interval]
+        self._timers[name] = timer
+        heapq.heappush(self._heap, timer)
+
+    def after(self, delay, name, callback):
+        self.at(self.time + delay, name, callback)
+
+    def every(self, interval, name, callback):
+        self.at(self.time + interval, name, callback, interval)
+
+    def cancel(self, name):
+        timer = self._timers.pop(name, None)
+        if timer is not None:
+            timer[3] = None
+
+    def pending(self, name):
+        return name in self._timers
+
+    # Seconds until the named timer next fires, or None if it isn't pending
+    def remaining(self, name):
+        timer = self._timers.get(name)
+        if timer is None:
+            return None
+        return timer[0] - self.time
+
+    # Advance to `now` and fire everything that's due, earliest first.
+    # Callbacks may schedule more timers, including ones already due.
+    def run(self, now):
+        self.time = now
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            timer = heapq.heappop(heap)
+            due, _, name, callback, interval = timer
+            if callback is None:
+                continue
+            if interval is None:
+                del self._timers[name]
+            else:
+                # Re-arm from when it was due, not when it ran, so recurring
+                # timers don't drift
+                self._sequence += 1
+                timer[0] = due + interval
+                timer[1] = self._sequence
+                heapq.heappush(heap, timer)
+            callback()
@@ -0,0 +1,31 @@
+from engine import TICK_RATE
+
+
+# Fixed-timestep clock. Real frame times are fed into an accumulator which is
+# drained in whole simulation ticks; whatever is left over is exposed as
+# `alpha` so the renderer can interpolate between the last two ticks.
+class SimulationClock:
+    def __init__(self, tick_rate=TICK_RATE, max_ticks_per_frame=8):
+        self.tick_rate = tick_rate
+        self.dt = 1 / tick_rate
+        # Cap on catch-up work after a stall (window drag, breakpoint, ...)
+        # so one slow frame can't snowball into ever slower frames
+        self.max_ticks_per_frame = max_ticks_per_frame
+        self.accumulator = 0.0
+
+    # Add `frame_time` seconds of real time and return how many ticks the
+    # simulation should run this frame
+    def advance(self, frame_time):
+        self.accumulator += frame_time
+        ticks = int(self.accumulator / self.dt)
+        if ticks > self.max_ticks_per_frame:
+            ticks = self.max_ticks_per_frame
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= ticks * self.dt
+        return ticks
+
+    # Fraction of a tick left in the accumulator, between 0 and 1
+    @property
+    def alpha(self):
+        return self.accumulator / self.dt
@@ -0,0 +1,96 @@
+import numpy as np
+
+
+# Uniform grid over the playfield indexing entity pool slots by the cell
+# their top-left corner is in. The index is kept as a compressed sparse row
+# table: slot numbers sorted by cell, plus where each cell's run starts, so a
+# row of neighbouring cells is one contiguous slice. update() is called with
+# the live positions whenever the pool may have changed and only rebuilds the
+# table if an entity crossed into another cell or the pool grew or shrank.
+#
+# Entities off the edges of the playfield (still above the screen, blown
+# sideways by the wind) are clamped into the border cells. That makes them
+# look closer than they are, never further, so queries stay correct.
+class SpatialGrid:
+    def __init__(self, width, height, cell_size=50):
+        self.cell_size = cell_size
+        self.cols = -(-width // cell_size)
+        self.rows = -(-height // cell_size)
+        self.cells = np.zeros(0, dtype=np.int16)
+        self.order = np.zeros(0, dtype=np.intp)
+        self.start = np.zeros(self.cols * self.rows + 1, dtype=np.intp)
+        self.rebuilds = 0
+
+    def _col(self, x):
+        return min(max(int(x // self.cell_size), 0), self.cols - 1)
+
+    def _row(self, y):
+        return min(max(int(y // self.cell_size), 0), self.rows - 1)
+
+    def update(self, x, y):
+        cols = np.clip(x // self.cell_size, 0, self.cols - 1).astype(np.int16)
+        rows = np.clip(y // self.cell_size, 0, self.rows - 1).astype(np.int16)
+        cells = rows * np.int16(self.cols) + cols
+        if len(cells) == len(self.cells) and np.array_equal(cells, self.cells):
+            return
+
+        # Counting sort by cell; NumPy radix sorts small ints
+        self.cells = cells
+        self.order = np.argsort(cells, kind="stable")
+        counts = np.bincount(cells, minlength=self.cols * self.rows)
+        np.cumsum(counts, out=self.start[1:])
+        self.rebuilds += 1
+
+    # Slots of the entities in columns col0..col1 of `row`
+    def _row_slice(self, row, col0, col1):
+        first = row * self.cols
+        return self.order[self.start[first + col0]:self.start[first + col1 + 1]]
+
+    # Slots of every entity whose top-left corner is in a cell touching the
+    # rectangle from (x0, y0) to (x1, y1)
+    def query(self, x0, y0, x1, y1):
+        col0, col1 = self._col(x0), self._col(x1)
+        parts = [self._row_slice(row, col0, col1) for row in range(self._row(y0), self._row(y1) + 1)]
+        return np.concatenate(parts)
+
+    # Slots in the square ring of cells `radius` cells away from (col, row)
+    def _ring(self, col, row, radius):
+        col0, col1 = max(col - radius, 0), min(col + radius, self.cols - 1)
+        parts = []
+        for r in (row - radius, row + radius) if radius else (row,):
+            if 0 <= r < self.rows:
+                parts.append(self._row_slice(r, col0, col1))
+        for r in range(max(row - radius + 1, 0), min(row + radius, self.rows)):
+            if col - radius >= 0:
+                parts.append(self._row_slice(r, col - radius, col - radius))
+            if col + radius < self.cols:
+                parts.append(self._row_slice(r, col + radius, col + radius))
+        return parts
+
+    # Slot of the entity closest to (px, py) among those where `mask` is
+    # True, or -1. Searches rings of cells outward and stops once no cell
+    # further out could hold anything closer than the best so far. Ties go
+    # to the lowest slot, like np.argmin over the whole pool.
+    def nearest(self, px, py, x, y, mask):
+        col, row = self._col(px), self._row(py)
+        max_radius = max(col, self.cols - 1 - col, row, self.rows - 1 - row)
+        found = []
+        best = np.inf
+        for radius in range(max_radius + 1):
+            # Everything in this ring or beyond is at least this far away
+            reach = (radius - 1) * self.cell_size
+            if reach > 0 and best < reach * reach:
+                break
+            parts = self._ring(col, row, radius)
+            if not parts:
+                continue
+            slots = np.concatenate(parts)
+            slots = slots[mask[slots]]
+            if len(slots):
+                found.append(slots)
+                best = min(best, float(np.min((x[slots] - px) ** 2 + (y[slots] - py) ** 2)))
+
+        if not found:
+            return -1
+        slots = np.sort(np.concatenate(found))
+        return int(slots[np.argmin((x[slots] - px) ** 2 + (y[slots] - py) ** 2)])
@@ -0,0 +1,146 @@
+import argparse
+import csv
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from batch_sim import BOTS, BatchSimulator, distribution, parse_override
+from engine import GameSettings, TICK_RATE
+
+STATS = ("mean", "std", "p10", "p50", "p90", "max")
+
+
+# Parameter sweep for difficulty balancing. Every parameter set is played
+# `games` times by a bot, split into chunks that are handed to a pool of
+# worker processes. Each chunk is a seeded BatchSimulator run, so a sweep
+# gives the same numbers on any machine and any number of workers. Rows are
+# written to the CSV as soon as all chunks of a parameter set are back.
+#
+#   python sweep.py --grid base_obstacle_speed=4,5,6 --grid obstacle_spawn_rate=20,30
+#   python sweep.py --sample combo_threshold=5:20 --sample savior_spawn_interval=10:30 --samples 40
+
+def make_settings(params):
+    settings = GameSettings()
+    for name, value in params.items():
+        setattr(settings, name, value)
+    return settings
+
+
+# Runs in a worker: play one chunk and send back the raw results
+def run_chunk(index, params, games, seed, bot, max_seconds):
+    sim = BatchSimulator(games, make_settings(params), seed)
+    sim.run(BOTS[bot], max_seconds)
+    return index, sim.final_score, sim.final_survival_score, int(np.count_nonzero(sim.finished))
+
+
+# Every combination of the --grid values
+def grid_points(specs):
+    settings = GameSettings()
+    axes = []
+    for spec in specs:
+        name, _, values = spec.partition("=")
+        axes.append([parse_override(settings, f"{name}={value}") for value in values.split(",")])
+    return [dict(point) for point in itertools.product(*axes)]
+
+
+# `count` random points from the --sample ranges. Whole-number fields are
+# sampled as integers when both ends of the range are.
+def sample_points(specs, count, rng):
+    settings = GameSettings()
+    ranges = []
+    for spec in specs:
+        name, _, bounds = spec.partition("=")
+        low, _, high = bounds.partition(":")
+        _, low = parse_override(settings, f"{name}={low}")
+        _, high = parse_override(settings, f"{name}={high}")
+        ranges.append((name, low, high))
+
+    points = []
+    for _ in range(count):
+        point = {}
+        for name, low, high in ranges:
+            if isinstance(low, int) and isinstance(high, int):
+                point[name] = int(rng.integers(low, high, endpoint=True))
+            else:
+                point[name] = float(rng.uniform(low, high))
+        points.append(point)
+    return points
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep GameSettings fields with a bot across all cores")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2,...",
+                        help="try every listed value (all --grid fields are combined)")
+    parser.add_argument("--sample", action="append", default=[], metavar="NAME=LOW:HIGH",
+                        help="draw values uniformly from a range")
+    parser.add_argument("--samples", type=int, default=20, help="random points to draw for --sample")
+    parser.add_argument("--bot", choices=sorted(BOTS), default="dodge")
+    parser.add_argument("--games", type=int, default=1000, help="games per parameter set")
+    parser.add_argument("--chunk", type=int, default=250, help="games per worker task")
+    parser.add_argument("--max-seconds", type=float, default=600, help="game time to stop at")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="sweep.csv")
+    args = parser.parse_args()
+    if not args.grid and not args.sample:
+        parser.error("give at least one --grid or --sample field")
+
+    # Grid points, each combined with every random sample
+    points = grid_points(args.grid)
+    if args.sample:
+        samples = sample_points(args.sample, args.samples, np.random.default_rng(args.seed))
+        points = [{**point, **sample} for point in points for sample in samples]
+    names = list(points[0])
+
+    chunks = [min(args.chunk, args.games - start) for start in range(0, args.games, args.chunk)]
+    print(f"{len(points)} parameter sets x {args.games} games, "
+          f"{len(points) * len(chunks)} tasks on {args.workers} workers")
+
+    columns = names + ["games", "ended"] + [f"{metric}_{stat}" for metric in ("score", "survival_seconds")
+                                            for stat in STATS]
+    scores = [[] for _ in points]
+    survival = [[] for _ in points]
+    ended = [0] * len(points)
+    waiting = [len(chunks)] * len(points)
+
+    start = time.perf_counter()
+    with open(args.out, "w", newline="") as f, ProcessPoolExecutor(args.workers) as pool:
+        writer = csv.writer(f)
+        writer.writerow(columns)
+        futures = [pool.submit(run_chunk, index, point, games, [args.seed, index, chunk],
+                               args.bot, args.max_seconds)
+                   for index, point in enumerate(points)
+                   for chunk, games in enumerate(chunks)]
+
+        done = 0
+        for future in as_completed(futures):
+            index, score, survival_score, finished = future.result()
+            scores[index].append(score)
+            survival[index].append(survival_score)
+            ended[index] += finished
+            waiting[index] -= 1
+            if waiting[index]:
+                continue
+
+            # Last chunk of this parameter set is in
+            score = distribution(np.concatenate(scores[index]))
+            survival_seconds = distribution(np.concatenate(survival[index]) / TICK_RATE)
+            writer.writerow([points[index][name] for name in names] + [args.games, ended[index]] +
+                            [f"{score[stat]:.2f}" for stat in STATS] +
+                            [f"{survival_seconds[stat]:.2f}" for stat in STATS])
+            f.flush()
+            scores[index] = survival[index] = None
+
+            done += 1
+            settings = ", ".join(f"{name}={points[index][name]}" for name in names)
+            print(f"[{done}/{len(points)}] {settings}: score p50 {score['p50']:.0f}, "
+                  f"survival p50 {survival_seconds['p50']:.1f}s")
+
+    print(f"Wrote {args.out} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
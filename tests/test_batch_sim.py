@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from batch_sim import BatchSimulator
+from engine import GameEngine
+from entities import SAVIOR, FAKE_SAVIOR
+
+
+# One tick of both simulators with entities of `kinds`, in slot order,
+# landing on the player together
+def step_overlapping(lives, kinds=(0, SAVIOR)):
+    engine = GameEngine(seed=0)
+    batch = BatchSimulator(1, seed=0)
+    settings = engine.settings
+    settings.lives = batch.lives[0] = lives
+
+    x = engine.player_x
+    y = engine.player_y - settings.obstacle_size + 2
+    engine.entities.clear()
+    for kind in kinds:
+        engine.entities.spawn(x, y, kind)
+    engine.prev_player_x = engine.player_x
+    engine.update_entities()
+
+    batch.player_x[0] = x
+    count = len(kinds)
+    batch.x[0, :count] = x
+    batch.y[0, :count] = y
+    batch.kind[0, :count] = kinds
+    batch.active[0, :count] = True
+    batch.update_entities(batch.player_x.copy())
+    return settings, batch
+
+
+@pytest.mark.parametrize("lives", [1, 2, 3, 4])
+def test_savior_and_hit_on_the_same_tick(lives):
+    settings, batch = step_overlapping(lives)
+    assert (batch.lives[0] <= 0) == settings.game_over
+    if not settings.game_over:
+        assert batch.lives[0] == settings.lives
+
+
+@pytest.mark.parametrize("kinds", [(SAVIOR, FAKE_SAVIOR), (FAKE_SAVIOR, SAVIOR)])
+@pytest.mark.parametrize("lives", [1, 2, 3])
+def test_savior_and_fake_apply_in_slot_order(lives, kinds):
+    settings, batch = step_overlapping(lives, kinds)
+    assert (batch.lives[0] <= 0) == settings.game_over
+    if not settings.game_over:
+        assert batch.lives[0] == settings.lives
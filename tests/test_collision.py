@@ -0,0 +1,64 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from engine import GameSettings, SCREEN_HEIGHT
+from entities import EntityPool, swept_overlap
+
+SETTINGS = GameSettings()
+PLAYER = SETTINGS.player_size
+SIZE = SETTINGS.obstacle_size
+PLAYER_X = 375.0
+PLAYER_Y = SCREEN_HEIGHT - PLAYER - 10
+
+
+def touches(x, y, dx, dy, box_dx=0.0):
+    return bool(swept_overlap(np.array([x]), np.array([y]), SIZE, dx, dy,
+                              PLAYER_X, PLAYER_Y, PLAYER, PLAYER, box_dx)[0])
+
+
+# Falls from fully above the player to fully below it in one tick
+def test_fast_obstacle_cannot_tunnel():
+    dy = PLAYER + SIZE + 30
+    end_y = PLAYER_Y + PLAYER + 10
+    assert end_y - dy + SIZE < PLAYER_Y
+    pool = EntityPool()
+    pool.spawn(PLAYER_X + 5, end_y, 0)
+    assert not pool.overlaps(SIZE, PLAYER_X, PLAYER_Y, PLAYER, PLAYER)[0]
+    assert touches(PLAYER_X + 5, end_y, 0.0, dy)
+
+
+@pytest.mark.parametrize("x, y, dx, dy", [
+    (PLAYER_X, PLAYER_Y - SIZE, 0.0, 10.0),               # bottom edge reaches the player's top
+    (PLAYER_X - SIZE, PLAYER_Y, 2.0, 0.0),                # right edge reaches the player's left
+    (PLAYER_X + PLAYER, PLAYER_Y, -2.0, 0.0),             # left edge reaches the player's right
+])
+def test_touching_an_edge_at_the_end_is_not_a_hit(x, y, dx, dy):
+    assert not touches(x, y, dx, dy)
+
+
+# The player moves into a power-up that isn't moving sideways
+def test_player_moving_into_a_powerup():
+    speed = SETTINGS.player_speed
+    x = PLAYER_X + PLAYER - 3
+    assert x > PLAYER_X - speed + PLAYER
+    assert touches(x, PLAYER_Y, 0.0, 0.0, box_dx=speed)
+    assert not touches(x + 10, PLAYER_Y, 0.0, 0.0, box_dx=speed)
+
+
+# With nothing moving the swept test is the plain overlap test
+@pytest.mark.parametrize("seed", range(10))
+def test_stationary_matches_overlaps(seed):
+    rng = np.random.default_rng(seed)
+    pool = EntityPool()
+    # A 5 px lattice around the player, so many boxes share an edge with it
+    for x, y in zip(rng.integers(60, 95, 500) * 5, rng.integers(95, 125, 500) * 5):
+        pool.spawn(x, y, 0)
+    expected = pool.overlaps(SIZE, PLAYER_X, PLAYER_Y, PLAYER, PLAYER)
+    swept = pool.swept_overlaps(SIZE, 0.0, 0.0, PLAYER_X, PLAYER_Y, PLAYER, PLAYER)
+    assert expected.any() and not expected.all()
+    assert np.array_equal(swept, expected)
@@ -0,0 +1,72 @@
+import argparse
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from engine import GameEngine, INPUT_LEFT, INPUT_RIGHT, INPUT_RESTART
+from replay import HEADER, MAGIC, VERSION, Replay, ReplayError, ReplayRecorder, seed_arg, verify
+
+SEED = 42
+TICKS = 3500
+
+
+# Sway left and right, and start a new game every 1000 ticks so most of the
+# recording is played rather than spent on the game over screen. The last
+# game starts at tick 2901 and is the one the recorded scores come from.
+def scripted_input(tick):
+    if tick % 1000 == 900:
+        return INPUT_RESTART
+    return INPUT_LEFT if (tick // 45) % 2 else INPUT_RIGHT
+
+
+def record():
+    recorder = ReplayRecorder(GameEngine(seed=SEED))
+    for tick in range(TICKS):
+        recorder.step(scripted_input(tick))
+    return recorder.replay()
+
+
+def test_saved_replay_verifies(tmp_path):
+    path = str(tmp_path / "game.replay")
+    record().save(path)
+    replay = Replay.load(path)
+    assert replay.seed == SEED
+    assert len(replay) == TICKS
+    ok, _ = verify(replay)
+    assert ok
+
+
+def test_changed_input_mismatches():
+    replay = record()
+    inputs = bytearray(replay.inputs)
+    # Drop the last restart, so the replay ends on the game before it
+    inputs[2900] = INPUT_LEFT
+    ok, _ = verify(Replay(replay.seed, inputs, replay.score, replay.survival_score))
+    assert not ok
+
+
+@pytest.mark.parametrize("magic, version", [(b"NOPE", VERSION), (MAGIC, VERSION - 1), (MAGIC, VERSION + 1)])
+def test_wrong_header_is_rejected(tmp_path, magic, version):
+    path = str(tmp_path / "game.replay")
+    record().save(path)
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+    _, _, *rest = HEADER.unpack_from(data)
+    HEADER.pack_into(data, 0, magic, version, *rest)
+    with open(path, "wb") as f:
+        f.write(data)
+    with pytest.raises(ReplayError):
+        Replay.load(path)
+
+
+@pytest.mark.parametrize("text, valid", [("-1", False), ("0", True), (str(2 ** 64 - 1), True),
+                                         (str(2 ** 64), False)])
+def test_seed_arg_range(text, valid):
+    if valid:
+        assert seed_arg(text) == int(text)
+    else:
+        with pytest.raises(argparse.ArgumentTypeError):
+            seed_arg(text)
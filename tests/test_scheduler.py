@@ -0,0 +1,74 @@
+import math
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from scheduler import Scheduler
+
+
+def test_scheduling_a_pending_name_replaces_it():
+    scheduler = Scheduler()
+    fired = []
+    scheduler.after(1.0, "effect", lambda: fired.append("first"))
+    scheduler.after(2.0, "effect", lambda: fired.append("second"))
+    assert len(scheduler) == 1
+    scheduler.run(1.5)
+    assert fired == []
+    scheduler.run(2.0)
+    assert fired == ["second"]
+    assert not scheduler.pending("effect")
+
+
+def test_cancel():
+    scheduler = Scheduler()
+    fired = []
+    scheduler.after(1.0, "effect", lambda: fired.append("effect"))
+    scheduler.cancel("effect")
+    scheduler.cancel("never scheduled")
+    assert not scheduler.pending("effect")
+    assert scheduler.remaining("effect") is None
+    scheduler.run(5.0)
+    assert fired == []
+
+
+# Runs once per frame at 60 Hz, or once a second so several periods fall
+# due in one run. Either way the timer stays on multiples of its interval.
+@pytest.mark.parametrize("step", [1 / 60, 1.0])
+def test_recurring_timer_does_not_drift(step):
+    scheduler = Scheduler()
+    interval = 0.7
+    fired = []
+    scheduler.every(interval, "spawn", lambda: fired.append(scheduler.time))
+    frames = int(600 / step)
+    for frame in range(1, frames + 1):
+        scheduler.run(frame * step)
+    now = frames * step
+    assert len(fired) == math.floor(now / interval)
+    assert scheduler.remaining("spawn") == pytest.approx((len(fired) + 1) * interval - now)
+
+
+def test_ties_fire_in_scheduling_order():
+    scheduler = Scheduler()
+    fired = []
+    for name in ["c", "a", "b"]:
+        scheduler.at(1.0, name, lambda name=name: fired.append(name))
+    scheduler.run(1.0)
+    assert fired == ["c", "a", "b"]
+
+
+def test_callback_can_schedule_a_timer_that_is_already_due():
+    scheduler = Scheduler()
+    fired = []
+
+    def first():
+        fired.append("first")
+        scheduler.at(0.5, "second", lambda: fired.append("second"))
+        scheduler.after(0.0, "third", lambda: fired.append("third"))
+
+    scheduler.at(1.0, "first", first)
+    scheduler.run(1.0)
+    assert fired == ["first", "second", "third"]
+    assert len(scheduler) == 0
@@ -0,0 +1,71 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from engine import GameSettings, SCREEN_WIDTH, SCREEN_HEIGHT
+from entities import EntityPool
+from spatial import SpatialGrid
+
+
+# A pool spread over and around the screen: above it as if just spawned and
+# past the sides as if blown by the wind. Positions are on a coarse lattice
+# so equal distances, and whole stacks of entities on one spot, are common.
+def random_pool(rng, count):
+    pool = EntityPool()
+    for x, y in zip(rng.integers(-10, 90, count) * 10, rng.integers(-20, 65, count) * 10):
+        pool.spawn(x, y, 0)
+    return pool
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_nearest_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    pool = random_pool(rng, int(rng.integers(1, 300)))
+    x, y, _ = pool.live()
+    grid = SpatialGrid(SCREEN_WIDTH, SCREEN_HEIGHT)
+    grid.update(x, y)
+
+    for _ in range(50):
+        px, py = rng.integers(0, 80) * 10, rng.integers(0, 60) * 10
+        mask = rng.random(len(x)) < rng.choice([0.0, 0.1, 0.5, 1.0])
+        distance = np.where(mask, (x - px) ** 2 + (y - py) ** 2, np.inf)
+        expected = int(np.argmin(distance)) if mask.any() else -1
+        assert grid.nearest(px, py, x, y, mask) == expected
+
+
+# The same broad phase GameEngine.update_entities runs before its swept test
+@pytest.mark.parametrize("seed", range(20))
+def test_query_finds_everything_touching_the_player(seed):
+    rng = np.random.default_rng(seed)
+    settings = GameSettings()
+    size = settings.obstacle_size
+    pool = random_pool(rng, 400)
+    x, y, _ = pool.live()
+    grid = SpatialGrid(SCREEN_WIDTH, SCREEN_HEIGHT)
+    player_y = SCREEN_HEIGHT - settings.player_size - 10
+
+    for _ in range(50):
+        dx = float(rng.choice([0, -2, 2]))
+        dy = float(rng.uniform(1, 120))
+        prev_player_x = float(rng.uniform(0, SCREEN_WIDTH - settings.player_size))
+        player_x = prev_player_x + float(rng.choice([-1, 0, 1])) * settings.player_speed
+        # Entities already moved this tick, lined up on the player's path
+        moved_x = x + rng.uniform(-5, 5, len(x))
+        moved_y = player_y + rng.uniform(-size - dy, settings.player_size + dy, len(y))
+        x[:], y[:] = moved_x, moved_y
+
+        grid.update(x, y)
+        reach_x = size + abs(dx)
+        reach_y = size + dy
+        left = min(player_x, prev_player_x)
+        right = max(player_x, prev_player_x) + settings.player_size
+        nearby = grid.query(left - reach_x, player_y - reach_y,
+                            right + reach_x, player_y + settings.player_size + reach_y)
+
+        touching = pool.swept_overlaps(size, dx, dy, player_x, player_y, settings.player_size,
+                                       settings.player_size, box_dx=player_x - prev_player_x)
+        assert set(np.flatnonzero(touching).tolist()) <= set(nearby.tolist())
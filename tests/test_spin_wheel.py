@@ -0,0 +1,73 @@
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from engine import GameEngine, INPUT_SPIN, spin_wheel_sector, spin_wheel_stop
+
+# Options that don't restart or exit the game, so the result stays readable
+OPTIONS = ["A", "B", "C"]
+
+
+# The per-tick loop update_spin_wheel ran before the closed form: the tick
+# the wheel stopped on and the sector it stopped in
+def loop_stop(angle, speed, deceleration, options):
+    ticks = 0
+    while True:
+        ticks += 1
+        speed -= deceleration
+        if speed <= 0:
+            return ticks, int((angle % 360) / (360 / options))
+        angle += speed
+
+
+@pytest.mark.parametrize("deceleration", [0.2, 0.05, 0.37, 1.0])
+@pytest.mark.parametrize("options", [3, 5])
+def test_closed_form_matches_the_loop(deceleration, options):
+    rng = random.Random(f"{deceleration}-{options}")
+    for _ in range(2000):
+        angle = rng.uniform(0, 360)
+        speed = rng.uniform(10, 20)
+        stop_ticks, turn = spin_wheel_stop(speed, deceleration)
+        assert (stop_ticks, spin_wheel_sector(angle + turn, options)) == \
+            loop_stop(angle, speed, deceleration, options)
+
+
+def spun_engine(seed, animated):
+    engine = GameEngine(seed=seed)
+    settings = engine.settings
+    settings.game_over = True
+    settings.spin_wheel_active = True
+    settings.spin_wheel_options = OPTIONS
+    settings.spin_wheel_animated = animated
+    engine.step(INPUT_SPIN)
+    return engine
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_animated_spin_stops_on_the_prediction(seed):
+    engine = spun_engine(seed, animated=True)
+    settings = engine.settings
+    assert settings.spin_wheel_spinning
+    assert settings.spin_wheel_outcome in OPTIONS
+    ticks = 0
+    while settings.spin_wheel_spinning:
+        engine.step(0)
+        ticks += 1
+    assert ticks == settings.spin_wheel_stop_ticks
+    assert settings.spin_wheel_result == settings.spin_wheel_outcome
+    assert loop_stop(settings.spin_wheel_start_angle, settings.spin_wheel_start_speed,
+                     settings.spin_wheel_deceleration, len(OPTIONS)) == \
+        (ticks, OPTIONS.index(settings.spin_wheel_result))
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_unanimated_spin_applies_on_the_spin_tick(seed):
+    engine = spun_engine(seed, animated=False)
+    settings = engine.settings
+    assert not settings.spin_wheel_spinning
+    assert settings.spin_wheel_result is not None
+    assert settings.spin_wheel_result == settings.spin_wheel_outcome